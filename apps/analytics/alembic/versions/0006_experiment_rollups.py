@@ -0,0 +1,35 @@
+"""add experiment rollups table
+
+Revision ID: 0006_experiment_rollups
+Revises: 0005_execution_tables
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_experiment_rollups"
+down_revision = "0005_execution_tables"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "experiment_rollups",
+        sa.Column("id", sa.Uuid(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("experiment_id", sa.Uuid(as_uuid=True), nullable=False),
+        sa.Column("variant_name", sa.Text(), nullable=False),
+        sa.Column("clicks", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("conversions", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("spend_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(
+            ["experiment_id"], ["experiments.id"], ondelete="CASCADE"
+        ),
+        sa.UniqueConstraint("experiment_id", "variant_name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("experiment_rollups")
@@ -0,0 +1,26 @@
+"""add experiments.last_analyzed_result_id
+
+Revision ID: 0007_experiment_last_analyzed
+Revises: 0006_experiment_rollups
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007_experiment_last_analyzed"
+down_revision = "0006_experiment_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "experiments",
+        sa.Column("last_analyzed_result_id", sa.Uuid(as_uuid=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("experiments", "last_analyzed_result_id")
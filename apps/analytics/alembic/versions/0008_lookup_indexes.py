@@ -0,0 +1,38 @@
+"""add campaign lookup indexes
+
+Revision ID: 0008_lookup_indexes
+Revises: 0007_experiment_last_analyzed
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0008_lookup_indexes"
+down_revision = "0007_experiment_last_analyzed"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_channel_snapshots_campaign_channel",
+        "channel_snapshots",
+        ["campaign_id", "channel"],
+    )
+    op.create_index(
+        "ix_campaign_briefs_campaign_created",
+        "campaign_briefs",
+        ["campaign_id", "created_at"],
+    )
+    op.create_index(
+        "ix_campaign_plans_campaign_created",
+        "campaign_plans",
+        ["campaign_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_campaign_plans_campaign_created", table_name="campaign_plans")
+    op.drop_index("ix_campaign_briefs_campaign_created", table_name="campaign_briefs")
+    op.drop_index("ix_channel_snapshots_campaign_channel", table_name="channel_snapshots")
@@ -1,5 +1,7 @@
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.db import _json_serializer
 from app.settings import settings
 
 
@@ -16,7 +18,12 @@ def _async_url(url: str) -> str:
 
 def get_async_engine(url: str | None = None):
     effective_url = _async_url(url or settings.DATABASE_URL)
-    return create_async_engine(effective_url, pool_pre_ping=True)
+    return create_async_engine(
+        effective_url,
+        pool_pre_ping=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
 
 
 async_engine = get_async_engine()
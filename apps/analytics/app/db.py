@@ -1,3 +1,4 @@
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
@@ -8,8 +9,18 @@ class Base(DeclarativeBase):
     pass
 
 
+def _json_serializer(value) -> str:
+    """Encode JSON/JSONB column values with orjson instead of stdlib json."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 def get_engine(url: str | None = None):
-    return create_engine(url or settings.DATABASE_URL, pool_pre_ping=True)
+    return create_engine(
+        url or settings.DATABASE_URL,
+        pool_pre_ping=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
 
 
 engine = get_engine()
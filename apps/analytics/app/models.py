@@ -47,6 +47,7 @@ class Campaign(Base):
 
 class ChannelSnapshot(Base):
     __tablename__ = "channel_snapshots"
+    __table_args__ = (Index("ix_channel_snapshots_campaign_channel", "campaign_id", "channel"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     campaign_id: Mapped[uuid.UUID] = mapped_column(
@@ -90,6 +91,7 @@ class MeasurementReport(Base):
 
 class CampaignBrief(Base):
     __tablename__ = "campaign_briefs"
+    __table_args__ = (Index("ix_campaign_briefs_campaign_created", "campaign_id", "created_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     campaign_id: Mapped[uuid.UUID] = mapped_column(
@@ -137,6 +139,7 @@ class ChannelBudget(Base):
 
 class CampaignPlan(Base):
     __tablename__ = "campaign_plans"
+    __table_args__ = (Index("ix_campaign_plans_campaign_created", "campaign_id", "created_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     campaign_id: Mapped[uuid.UUID] = mapped_column(
@@ -200,6 +203,9 @@ class Experiment(Base):
     min_sample_conversions: Mapped[int] = mapped_column(Integer, nullable=False, default=20)
     min_sample_clicks: Mapped[int | None] = mapped_column(Integer, nullable=True)
     confidence: Mapped[float] = mapped_column(Numeric, nullable=False, default=0.95)
+    last_analyzed_result_id: Mapped[uuid.UUID | None] = mapped_column(
+        Uuid(as_uuid=True), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     campaign: Mapped[Campaign] = relationship(back_populates="experiments")
@@ -209,6 +215,9 @@ class Experiment(Base):
     results: Mapped[list["ExperimentResult"]] = relationship(
         back_populates="experiment", cascade="all, delete-orphan"
     )
+    rollups: Mapped[list["ExperimentRollup"]] = relationship(
+        back_populates="experiment", cascade="all, delete-orphan"
+    )
 
 
 class ExperimentVariant(Base):
@@ -246,6 +255,22 @@ class ExperimentResult(Base):
     experiment: Mapped[Experiment] = relationship(back_populates="results")
 
 
+class ExperimentRollup(Base):
+    __tablename__ = "experiment_rollups"
+    __table_args__ = (UniqueConstraint("experiment_id", "variant_name"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    experiment_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("experiments.id", ondelete="CASCADE"), nullable=False
+    )
+    variant_name: Mapped[str] = mapped_column(Text, nullable=False)
+    clicks: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    conversions: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    spend_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    experiment: Mapped[Experiment] = relationship(back_populates="rollups")
+
+
 # ---------------------------------------------------------------------------
 # Agent framework models
 # ---------------------------------------------------------------------------
@@ -15,7 +15,7 @@ from app.platforms.exceptions import (
     ImageValidationError,
     PlatformError,
 )
-from app.platforms.factory import get_platform_adapter
+from app.platforms.factory import clear_adapter_cache, get_platform_adapter
 from app.platforms.meta_ads import MetaAdsAdapter
 
 __all__ = [
@@ -33,5 +33,6 @@ __all__ = [
     "Platform",
     "PlatformError",
     "ValidationIssue",
+    "clear_adapter_cache",
     "get_platform_adapter",
 ]
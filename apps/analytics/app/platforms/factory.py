@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+
 from app.platforms.base import AdPlatformAdapter, Platform
 from app.platforms.dry_run import DryRunExecutor
 
@@ -11,12 +13,25 @@ def get_platform_adapter(
 
     When dry_run=True, all platforms use the DryRunExecutor.
     Otherwise, routes to the real platform adapter (Meta supported).
+
+    Dry-run executors keep per-instance idempotency state, so each call gets a
+    fresh one. Real adapters are cached per platform, so SDK initialisation is
+    paid for once per process; call ``clear_adapter_cache()`` after changing
+    credentials.
     """
     if dry_run:
         return DryRunExecutor()
+    try:
+        platform = Platform(platform)
+    except ValueError:
+        pass  # unknown platforms fall through to NotImplementedError below
+    return _live_adapter(platform)
+
 
+@functools.lru_cache(maxsize=len(Platform))
+def _live_adapter(platform: Platform | str) -> AdPlatformAdapter:
     # Route to real adapters
-    if platform in (Platform.META, "meta"):
+    if platform is Platform.META:
         from app.platforms.meta_ads import MetaAdsAdapter
         from app.settings import settings
 
@@ -30,3 +45,8 @@ def get_platform_adapter(
     raise NotImplementedError(
         f"Real adapter for {platform} not yet implemented. Use dry_run=True."
     )
+
+
+def clear_adapter_cache() -> None:
+    """Drop cached real adapters, e.g. after rotating platform credentials."""
+    _live_adapter.cache_clear()
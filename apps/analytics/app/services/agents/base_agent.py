@@ -206,7 +206,7 @@ class BaseAgent:
             # Extract tool calls
             tool_calls = [b for b in content_blocks if b["type"] == "tool_use"]
 
-            # Record thinking decision
+            # Record thinking decision; it is written with the step's next flush
             if reasoning:
                 db.add(
                     AgentDecision(
@@ -216,7 +216,6 @@ class BaseAgent:
                         reasoning=reasoning,
                     )
                 )
-                await db.flush()
 
             # If no tool calls, the agent is done
             if not tool_calls:
@@ -237,63 +236,72 @@ class BaseAgent:
             tool_results: list[dict[str, Any]] = []
             paused = False
 
-            for tool_call in tool_calls:
-                tool_name = tool_call["name"]
-                tool_input = tool_call["input"]
-                tool_use_id = tool_call["id"]
-
-                spec = self.registry.get(tool_name)
-
-                # Record act decision
-                act_decision = AgentDecision(
-                    session_id=session.id,
-                    step_number=step,
-                    phase="act",
-                    tool_name=tool_name,
-                    tool_input=tool_input,
-                    requires_approval=spec.requires_approval if spec else False,
-                )
-                db.add(act_decision)
-                await db.flush()
-
-                # Check if approval is required
-                if spec and spec.requires_approval:
-                    session.status = "awaiting_approval"
-                    session.context_json = {
-                        **{k: v for k, v in session.context_json.items() if not k.startswith("_")},
-                        "_pending_tool_call": {
-                            "tool_use_id": tool_use_id,
-                            "tool_name": tool_name,
-                            "tool_input": tool_input,
-                            "decision_id": str(act_decision.id),
-                        },
-                        "_messages": messages,
-                    }
-                    await db.flush()
-                    paused = True
-                    break
-
-                # Execute tool
-                result = await self.registry.execute(
-                    tool_name,
-                    {**tool_input, "_db_session": db},
-                    session_id=session.id,
-                    decision_id=act_decision.id,
-                    db=db,
-                )
+            # Act decisions and the log rows written by tools in this step are
+            # flushed together with the observe decision below. A tool that
+            # queries the session triggers autoflush, which writes the rows
+            # pending at that point early.
+            async with self.registry.batch_actions(db):
+                for tool_call in tool_calls:
+                    tool_name = tool_call["name"]
+                    tool_input = tool_call["input"]
+                    tool_use_id = tool_call["id"]
+
+                    spec = self.registry.get(tool_name)
+
+                    # Record act decision. The id is assigned here, so it can be
+                    # referenced before the row is flushed.
+                    act_decision = AgentDecision(
+                        id=uuid.uuid4(),
+                        session_id=session.id,
+                        step_number=step,
+                        phase="act",
+                        tool_name=tool_name,
+                        tool_input=tool_input,
+                        requires_approval=spec.requires_approval if spec else False,
+                    )
+                    db.add(act_decision)
+
+                    # Check if approval is required
+                    if spec and spec.requires_approval:
+                        session.status = "awaiting_approval"
+                        session.context_json = {
+                            **{
+                                k: v
+                                for k, v in session.context_json.items()
+                                if not k.startswith("_")
+                            },
+                            "_pending_tool_call": {
+                                "tool_use_id": tool_use_id,
+                                "tool_name": tool_name,
+                                "tool_input": tool_input,
+                                "decision_id": str(act_decision.id),
+                            },
+                            "_messages": messages,
+                        }
+                        paused = True
+                        break
+
+                    # Execute tool
+                    result = await self.registry.execute(
+                        tool_name,
+                        {**tool_input, "_db_session": db},
+                        session_id=session.id,
+                        decision_id=act_decision.id,
+                        db=db,
+                    )
 
-                act_decision.tool_output = (
-                    result.output if result.success else {"error": result.error}
-                )
-                await db.flush()
+                    act_decision.tool_output = (
+                        result.output if result.success else {"error": result.error}
+                    )
 
-                tool_results.append({
-                    "type": "tool_result",
-                    "tool_use_id": tool_use_id,
-                    "content": _format_tool_output(result),
-                })
+                    tool_results.append({
+                        "type": "tool_result",
+                        "tool_use_id": tool_use_id,
+                        "content": _format_tool_output(result),
+                    })
 
             if paused:
+                await db.flush()
                 return session
 
             # OBSERVE: Feed tool results back to LLM
@@ -1,14 +1,73 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import re
 import time
 import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable
+from typing import Any, AsyncIterator, Awaitable, Callable
 
+import orjson
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_RESULT_CACHE_MAXSIZE = 1024
+# Logged tool input/output larger than this is replaced by a digest and preview
+_JSON_BUDGET_BYTES = 16384
+_JSON_PREVIEW_BYTES = 1024
 
-@dataclass(frozen=True)
+Handler = Callable[..., Awaitable[dict[str, Any]]]
+
+# Rows collected while a ToolRegistry.batch_actions() block is active.
+_pending_actions: ContextVar[list[Any] | None] = ContextVar("_pending_actions", default=None)
+
+
+def _tokenize(text: str) -> set[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def _bounded_json(payload: dict[str, Any]) -> dict[str, Any]:
+    """Return payload, or a truncated stand-in if it exceeds the logging budget."""
+    blob = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    if len(blob) <= _JSON_BUDGET_BYTES:
+        return payload
+    return {
+        "_truncated": True,
+        "_size_bytes": len(blob),
+        "_sha256": hashlib.sha256(blob).hexdigest(),
+        "_preview": blob[:_JSON_PREVIEW_BYTES].decode(errors="replace"),
+    }
+
+
+def _anthropic_schema(spec: ToolSpec) -> dict[str, Any]:
+    return {
+        "name": spec.name,
+        "description": spec.description,
+        "input_schema": spec.parameters_schema,
+    }
+
+
+async def persist_record(db: AsyncSession, record: Any) -> None:
+    """Insert a log row (ToolExecution, ExecutionAction).
+
+    Inside ToolRegistry.batch_actions() the row is deferred and flushed with
+    the rest of the batch; otherwise it is added and flushed immediately.
+    """
+    pending = _pending_actions.get()
+    if pending is not None:
+        pending.append(record)
+        return
+    db.add(record)
+    await db.flush()
+
+
+@dataclass(frozen=True, slots=True)
 class ToolSpec:
     """Metadata for a registered tool."""
 
@@ -18,9 +77,12 @@ class ToolSpec:
     parameters_schema: dict[str, Any]  # JSON Schema for tool parameters
     requires_approval: bool = False
     version: str = "1.0.0"
+    cacheable: bool = False  # Pure, non-DB fetch; results may be reused within cache_ttl_s
+    cache_ttl_s: float = 0
+    persist_execution: bool = True  # False for no-op tools not worth a ToolExecution row
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ToolResult:
     """Result of executing a tool."""
 
@@ -35,16 +97,49 @@ class ToolRegistry:
 
     def __init__(self) -> None:
         self._tools: dict[str, ToolSpec] = {}
-        self._handlers: dict[str, Callable[..., Awaitable[dict[str, Any]]]] = {}
+        # Spec and handler stored together so execute() does a single lookup
+        self._registered: dict[str, tuple[ToolSpec, Handler]] = {}
+        # Search index built at register time: token -> tool names, plus the
+        # lowercased name/description for substring fallback.
+        self._index: dict[str, set[str]] = {}
+        self._lowered: dict[str, tuple[str, str]] = {}
+        self._position: dict[str, int] = {}
+        # Tool row ids by (name, version); dropped when a session rolls back,
+        # since a freshly inserted row may not survive it.
+        self._tool_ids: dict[tuple[str, str], uuid.UUID] = {}
+        # Schemas for every tool, rebuilt lazily after a registration
+        self._all_schemas: list[dict[str, Any]] | None = None
+        # (tool name, canonical params JSON) -> (expires_at, output), LRU ordered
+        self._result_cache: OrderedDict[tuple[str, bytes], tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
 
     def register(
         self,
         spec: ToolSpec,
-        handler: Callable[..., Awaitable[dict[str, Any]]],
+        handler: Handler,
     ) -> None:
         """Register a tool with its handler function."""
+        if spec.name in self._tools:
+            self._unindex(spec.name)
         self._tools[spec.name] = spec
-        self._handlers[spec.name] = handler
+        self._registered[spec.name] = (spec, handler)
+        self._all_schemas = None
+        self._position.setdefault(spec.name, len(self._position))
+        self._lowered[spec.name] = (spec.name.lower(), spec.description.lower())
+        for token in _tokenize(f"{spec.name} {spec.description}"):
+            self._index.setdefault(token, set()).add(spec.name)
+
+    def _unindex(self, name: str) -> None:
+        """Remove a tool's postings from the search index."""
+        # Re-tokenizing the registered spec yields exactly the postings it
+        # added, so only those are visited rather than the whole index.
+        spec = self._tools[name]
+        for token in _tokenize(f"{spec.name} {spec.description}"):
+            names = self._index[token]
+            names.discard(name)
+            if not names:
+                del self._index[token]
 
     def get(self, name: str) -> ToolSpec | None:
         """Get a tool spec by name."""
@@ -58,30 +153,61 @@ class ToolRegistry:
         return tools
 
     def search(self, query: str) -> list[ToolSpec]:
-        """Search tools by name or description substring (case-insensitive)."""
-        query_lower = query.lower()
-        return [
-            t
-            for t in self._tools.values()
-            if query_lower in t.name.lower() or query_lower in t.description.lower()
-        ]
+        """Search tools by name or description (case-insensitive).
+
+        Whole-word queries are answered from the token index; if no tool
+        contains every query token, fall back to a substring match so
+        partial words (e.g. "camp") still find tools.
+        """
+        tokens = _tokenize(query)
+        hits: set[str] = set()
+        if tokens:
+            postings = [self._index.get(token, set()) for token in tokens]
+            hits = set.intersection(*postings)
+        if not hits:
+            query_lower = query.lower()
+            hits = {
+                name
+                for name, (name_lower, description_lower) in self._lowered.items()
+                if query_lower in name_lower or query_lower in description_lower
+            }
+        return [self._tools[n] for n in sorted(hits, key=self._position.__getitem__)]
+
+    @staticmethod
+    @asynccontextmanager
+    async def batch_actions(db: AsyncSession) -> AsyncIterator[None]:
+        """Defer log-row inserts made by tools until the block exits.
+
+        All rows recorded via persist_record() are added with one add_all()
+        and written with a single flush. Nested blocks join the outer batch.
+        """
+        if _pending_actions.get() is not None:
+            yield
+            return
+
+        token = _pending_actions.set([])
+        try:
+            yield
+        finally:
+            pending = _pending_actions.get() or []
+            _pending_actions.reset(token)
+            db.add_all(pending)
+        if pending:
+            await db.flush()
 
     def get_tool_schemas_for_anthropic(
         self, tool_names: list[str] | None = None
     ) -> list[dict[str, Any]]:
-        """Return tool definitions in Anthropic API format for the tools use feature."""
+        """Return tool definitions in Anthropic API format for the tools use feature.
+
+        The full list is built once per set of registrations and shared between
+        callers, so it must not be mutated.
+        """
         if tool_names is not None:
-            specs = [self._tools[n] for n in tool_names if n in self._tools]
-        else:
-            specs = list(self._tools.values())
-        return [
-            {
-                "name": spec.name,
-                "description": spec.description,
-                "input_schema": spec.parameters_schema,
-            }
-            for spec in specs
-        ]
+            return [_anthropic_schema(self._tools[n]) for n in tool_names if n in self._tools]
+        if self._all_schemas is None:
+            self._all_schemas = [_anthropic_schema(spec) for spec in self._tools.values()]
+        return self._all_schemas
 
     async def execute(
         self,
@@ -93,18 +219,28 @@ class ToolRegistry:
         db: AsyncSession | None = None,
     ) -> ToolResult:
         """Execute a tool by name with given parameters."""
-        spec = self._tools.get(name)
-        if spec is None:
+        registered = self._registered.get(name)
+        if registered is None:
             return ToolResult(success=False, output={}, error=f"Tool '{name}' not found")
+        spec, handler = registered
+
+        cache_key = self._cache_key(spec, params) if spec.cacheable else None
+        cached = self._cache_get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            result = ToolResult(success=True, output=cached, duration_ms=0)
+            if spec.persist_execution and db is not None and session_id is not None:
+                await self._log_execution(db, spec, params, result, session_id, decision_id)
+            return result
 
-        handler = self._handlers[name]
-        start = time.monotonic()
+        start = time.perf_counter_ns()
         try:
             output = await handler(**params)
-            duration_ms = int((time.monotonic() - start) * 1000)
+            duration_ms = (time.perf_counter_ns() - start) // 1_000_000
             result = ToolResult(success=True, output=output, duration_ms=duration_ms)
+            if cache_key is not None:
+                self._cache_put(cache_key, output, spec.cache_ttl_s)
         except Exception as exc:
-            duration_ms = int((time.monotonic() - start) * 1000)
+            duration_ms = (time.perf_counter_ns() - start) // 1_000_000
             result = ToolResult(
                 success=False,
                 output={},
@@ -113,11 +249,41 @@ class ToolRegistry:
             )
 
         # Persist execution record if DB session available
-        if db is not None and session_id is not None:
+        if spec.persist_execution and db is not None and session_id is not None:
             await self._log_execution(db, spec, params, result, session_id, decision_id)
 
         return result
 
+    @staticmethod
+    def _cache_key(spec: ToolSpec, params: dict[str, Any]) -> tuple[str, bytes]:
+        """Build the result-cache key, ignoring injected params like _db_session."""
+        public = {k: v for k, v in params.items() if not k.startswith("_")}
+        return spec.name, orjson.dumps(
+            public, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+
+    def _cache_get(self, key: tuple[str, bytes]) -> dict[str, Any] | None:
+        """Return a cached output if present and not expired."""
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, output = entry
+        if expires_at <= time.monotonic():
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        # Callers own their output; a shared dict would leak their mutations
+        return copy.deepcopy(output)
+
+    def _cache_put(self, key: tuple[str, bytes], output: dict[str, Any], ttl_s: float) -> None:
+        """Store a successful output, evicting the least recently used entry when full."""
+        if ttl_s <= 0:
+            return
+        self._result_cache[key] = (time.monotonic() + ttl_s, copy.deepcopy(output))
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > _RESULT_CACHE_MAXSIZE:
+            self._result_cache.popitem(last=False)
+
     async def _log_execution(
         self,
         db: AsyncSession,
@@ -128,42 +294,67 @@ class ToolRegistry:
         decision_id: uuid.UUID | None,
     ) -> None:
         """Persist a ToolExecution record."""
-        from app.models import Tool, ToolExecution
+        from app.models import ToolExecution
 
-        tool_row = await self._ensure_tool_row(db, spec)
+        tool_id = await self._ensure_tool_id(db, spec)
         # Strip internal params like _db_session before logging
         logged_params = {k: v for k, v in params.items() if not k.startswith("_")}
         execution = ToolExecution(
             session_id=session_id,
-            tool_id=tool_row.id,
+            tool_id=tool_id,
             decision_id=decision_id,
-            input_json=logged_params,
-            output_json=result.output if result.success else {"error": result.error},
+            input_json=_bounded_json(logged_params),
+            output_json=_bounded_json(result.output) if result.success else {"error": result.error},
             status="success" if result.success else "error",
             error_message=result.error,
             duration_ms=result.duration_ms,
         )
-        db.add(execution)
-        await db.flush()
+        await persist_record(db, execution)
+
+    def _forget_tool_ids(self, *_args: Any) -> None:
+        """Session ``after_soft_rollback`` hook: cached Tool ids may be gone."""
+        self._tool_ids.clear()
+
+    async def _ensure_tool_id(self, db: AsyncSession, spec: ToolSpec) -> uuid.UUID:
+        """Get or create the Tool row for persisting execution records.
 
-    async def _ensure_tool_row(self, db: AsyncSession, spec: ToolSpec) -> Any:
-        """Get or create the Tool row for persisting execution records."""
-        from sqlalchemy import select
+        Uses a single INSERT ... ON CONFLICT (name, version) DO NOTHING ...
+        RETURNING id, falling back to a SELECT when the row already exists,
+        and remembers the id so later executions skip the round-trip.
+        """
+        name, version = spec.name, spec.version
+        key = (name, version)
+        tool_id = self._tool_ids.get(key)
+        if tool_id is not None:
+            return tool_id
 
         from app.models import Tool
 
-        stmt = select(Tool).where(Tool.name == spec.name, Tool.version == spec.version)
-        result = await db.execute(stmt)
-        tool = result.scalars().first()
-        if tool is None:
-            tool = Tool(
-                name=spec.name,
-                version=spec.version,
+        if db.get_bind().dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        stmt = (
+            insert(Tool)
+            .values(
+                name=name,
+                version=version,
                 description=spec.description,
                 category=spec.category,
                 parameters_schema=spec.parameters_schema,
                 requires_approval=spec.requires_approval,
             )
-            db.add(tool)
-            await db.flush()
-        return tool
+            .on_conflict_do_nothing(index_elements=["name", "version"])
+            .returning(Tool.id)
+        )
+        tool_id = (await db.execute(stmt)).scalar_one_or_none()
+        if tool_id is None:
+            tool_id = (
+                await db.execute(select(Tool.id).where(Tool.name == name, Tool.version == version))
+            ).scalar_one()
+        session = db.sync_session
+        if not event.contains(session, "after_soft_rollback", self._forget_tool_ids):
+            event.listen(session, "after_soft_rollback", self._forget_tool_ids)
+        self._tool_ids[key] = tool_id
+        return tool_id
@@ -26,6 +26,7 @@ APPROVAL_SPEC = ToolSpec(
         "required": ["action_description"],
     },
     requires_approval=True,
+    persist_execution=False,
 )
 
 
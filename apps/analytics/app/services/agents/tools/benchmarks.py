@@ -25,6 +25,8 @@ BENCHMARKS_SPEC = ToolSpec(
         },
         "required": ["industry"],
     },
+    cacheable=True,
+    cache_ttl_s=3600,
 )
 
 _BENCHMARKS: dict[str, dict[str, dict[str, float]]] = {
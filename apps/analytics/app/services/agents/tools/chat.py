@@ -23,6 +23,7 @@ CHAT_SPEC = ToolSpec(
         },
         "required": ["message"],
     },
+    persist_execution=False,
 )
 
 
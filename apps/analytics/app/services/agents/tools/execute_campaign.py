@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import secrets
 import time
 import uuid
 from typing import Any
 
-from app.services.agents.tool_registry import ToolSpec
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.models import Campaign, Execution, ExecutionAction
+from app.platforms.base import (
+    AdPlatformAdapter,
+    AdSetSpec,
+    ExecutionPlan,
+    ExecutionResult,
+    Platform,
+)
+from app.platforms.factory import get_platform_adapter
+from app.services.agents.tool_registry import ToolSpec, persist_record
+from app.settings import settings
 
 EXECUTE_CAMPAIGN_SPEC = ToolSpec(
     name="execute_campaign_on_platform",
@@ -65,6 +80,17 @@ EXECUTE_CAMPAIGN_SPEC = ToolSpec(
     requires_approval=True,
 )
 
+_AD_SETS_ADAPTER = TypeAdapter(list[AdSetSpec])
+
+
+async def _create_on_platform(
+    adapter: AdPlatformAdapter, plan: ExecutionPlan, idempotency_key: str
+) -> tuple[ExecutionResult, int]:
+    """Call the adapter and return its result with the call duration in ms."""
+    start = time.perf_counter_ns()
+    result = await adapter.create_campaign(plan, idempotency_key=idempotency_key)
+    return result, (time.perf_counter_ns() - start) // 1_000_000
+
 
 async def execute_campaign_on_platform(
     campaign_id: str,
@@ -81,17 +107,10 @@ async def execute_campaign_on_platform(
     if _db_session is None:
         return {"error": "No database session available"}
 
-    from sqlalchemy import select
-
-    from app.models import Campaign, Execution, ExecutionAction
-    from app.platforms.base import AdSetSpec, ExecutionPlan, Platform
-    from app.platforms.factory import get_platform_adapter
-    from app.settings import settings
+    campaign_uuid = uuid.UUID(campaign_id)
 
     # Verify campaign exists
-    result = await _db_session.execute(
-        select(Campaign).where(Campaign.id == uuid.UUID(campaign_id))
-    )
+    result = await _db_session.execute(select(Campaign).where(Campaign.id == campaign_uuid))
     campaign = result.scalars().first()
     if campaign is None:
         return {"error": f"Campaign {campaign_id} not found"}
@@ -102,42 +121,54 @@ async def execute_campaign_on_platform(
         campaign_name=campaign_name,
         objective=objective,
         total_budget=total_budget,
-        ad_sets=[AdSetSpec(**a) for a in (ad_sets or [])],
+        ad_sets=_AD_SETS_ADAPTER.validate_python(ad_sets or []),
     )
 
     # Generate idempotency key
-    idempotency_key = f"exec-{campaign_id}-{platform}-{uuid.uuid4().hex[:8]}"
+    idempotency_key = f"exec-{campaign_id}-{platform}-{secrets.token_hex(4)}"
+
+    # The serialized plan is stored on both the execution and its action
+    plan_json = plan.model_dump(mode="json")
 
     # Create execution record
     execution = Execution(
-        campaign_id=uuid.UUID(campaign_id),
+        campaign_id=campaign_uuid,
         platform=platform,
         status="executing",
-        execution_plan=plan.model_dump(mode="json"),
+        execution_plan=plan_json,
         idempotency_key=idempotency_key,
     )
     _db_session.add(execution)
-    await _db_session.flush()
 
-    # Get adapter and execute
+    # Get adapter and execute. The flush only has to finish before the action
+    # row references execution.id, so it can run alongside the adapter call.
     adapter = get_platform_adapter(platform, dry_run=settings.USE_DRY_RUN_EXECUTION)
-
-    start = time.monotonic()
-    exec_result = await adapter.create_campaign(plan, idempotency_key=idempotency_key)
-    duration_ms = int((time.monotonic() - start) * 1000)
+    if settings.OVERLAP_LIVE_EXECUTION_FLUSH:
+        platform_call = asyncio.create_task(_create_on_platform(adapter, plan, idempotency_key))
+        try:
+            await _db_session.flush()
+        except BaseException:
+            # Without a persisted execution row the platform result can't be
+            # recorded, so don't leave the call running unobserved.
+            platform_call.cancel()
+            await asyncio.gather(platform_call, return_exceptions=True)
+            raise
+        exec_result, duration_ms = await platform_call
+    else:
+        await _db_session.flush()
+        exec_result, duration_ms = await _create_on_platform(adapter, plan, idempotency_key)
 
     # Record action
     action = ExecutionAction(
         execution_id=execution.id,
         action_type="create_campaign",
         idempotency_key=idempotency_key,
-        request_json=plan.model_dump(mode="json"),
+        request_json=plan_json,
         response_json=exec_result.model_dump(mode="json"),
         status="success" if exec_result.success else "error",
         error_message=exec_result.error,
         duration_ms=duration_ms,
     )
-    _db_session.add(action)
 
     # Update execution
     if exec_result.success:
@@ -149,7 +180,7 @@ async def execute_campaign_on_platform(
         execution.status = "failed"
         execution.error_message = exec_result.error
 
-    await _db_session.flush()
+    await persist_record(_db_session, action)
 
     return {
         "execution_id": str(execution.id),
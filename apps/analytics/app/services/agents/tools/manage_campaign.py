@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import secrets
 import time
 import uuid
 from typing import Any
 
-from app.services.agents.tool_registry import ToolSpec
+from sqlalchemy import select
+
+from app.models import Execution, ExecutionAction
+from app.platforms.base import Platform
+from app.platforms.factory import get_platform_adapter
+from app.services.agents.tool_registry import ToolSpec, persist_record
+from app.settings import settings
 
 PAUSE_CAMPAIGN_SPEC = ToolSpec(
     name="pause_platform_campaign",
@@ -71,15 +78,9 @@ UPDATE_BUDGET_SPEC = ToolSpec(
 )
 
 
-async def _get_execution(execution_id: str, db_session: Any) -> Any:
+async def _get_execution(execution_id: uuid.UUID, db_session: Any) -> Any:
     """Shared helper: load Execution by ID."""
-    from sqlalchemy import select
-
-    from app.models import Execution
-
-    result = await db_session.execute(
-        select(Execution).where(Execution.id == uuid.UUID(execution_id))
-    )
+    result = await db_session.execute(select(Execution).where(Execution.id == execution_id))
     return result.scalars().first()
 
 
@@ -93,25 +94,20 @@ async def pause_platform_campaign(
     if _db_session is None:
         return {"error": "No database session available"}
 
-    from app.models import ExecutionAction
-    from app.platforms.base import Platform
-    from app.platforms.factory import get_platform_adapter
-    from app.settings import settings
-
-    execution = await _get_execution(execution_id, _db_session)
+    execution = await _get_execution(uuid.UUID(execution_id), _db_session)
     if execution is None:
         return {"error": f"Execution {execution_id} not found"}
     if not execution.external_campaign_id:
         return {"error": "No external campaign ID -- campaign may not have been created yet"}
 
     adapter = get_platform_adapter(execution.platform, dry_run=settings.USE_DRY_RUN_EXECUTION)
-    idem_key = f"pause-{execution_id}-{uuid.uuid4().hex[:8]}"
+    idem_key = f"pause-{execution_id}-{secrets.token_hex(4)}"
 
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     result = await adapter.pause_campaign(
         execution.external_campaign_id, platform=Platform(execution.platform)
     )
-    duration_ms = int((time.monotonic() - start) * 1000)
+    duration_ms = (time.perf_counter_ns() - start) // 1_000_000
 
     action = ExecutionAction(
         execution_id=execution.id,
@@ -123,11 +119,9 @@ async def pause_platform_campaign(
         error_message=result.error,
         duration_ms=duration_ms,
     )
-    _db_session.add(action)
-
     if result.success:
         execution.status = "paused"
-    await _db_session.flush()
+    await persist_record(_db_session, action)
 
     return {
         "execution_id": execution_id,
@@ -147,25 +141,20 @@ async def resume_platform_campaign(
     if _db_session is None:
         return {"error": "No database session available"}
 
-    from app.models import ExecutionAction
-    from app.platforms.base import Platform
-    from app.platforms.factory import get_platform_adapter
-    from app.settings import settings
-
-    execution = await _get_execution(execution_id, _db_session)
+    execution = await _get_execution(uuid.UUID(execution_id), _db_session)
     if execution is None:
         return {"error": f"Execution {execution_id} not found"}
     if not execution.external_campaign_id:
         return {"error": "No external campaign ID"}
 
     adapter = get_platform_adapter(execution.platform, dry_run=settings.USE_DRY_RUN_EXECUTION)
-    idem_key = f"resume-{execution_id}-{uuid.uuid4().hex[:8]}"
+    idem_key = f"resume-{execution_id}-{secrets.token_hex(4)}"
 
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     result = await adapter.resume_campaign(
         execution.external_campaign_id, platform=Platform(execution.platform)
     )
-    duration_ms = int((time.monotonic() - start) * 1000)
+    duration_ms = (time.perf_counter_ns() - start) // 1_000_000
 
     action = ExecutionAction(
         execution_id=execution.id,
@@ -177,11 +166,9 @@ async def resume_platform_campaign(
         error_message=result.error,
         duration_ms=duration_ms,
     )
-    _db_session.add(action)
-
     if result.success:
         execution.status = "active"
-    await _db_session.flush()
+    await persist_record(_db_session, action)
 
     return {
         "execution_id": execution_id,
@@ -202,27 +189,22 @@ async def update_platform_budget(
     if _db_session is None:
         return {"error": "No database session available"}
 
-    from app.models import ExecutionAction
-    from app.platforms.base import Platform
-    from app.platforms.factory import get_platform_adapter
-    from app.settings import settings
-
-    execution = await _get_execution(execution_id, _db_session)
+    execution = await _get_execution(uuid.UUID(execution_id), _db_session)
     if execution is None:
         return {"error": f"Execution {execution_id} not found"}
     if not execution.external_campaign_id:
         return {"error": "No external campaign ID"}
 
     adapter = get_platform_adapter(execution.platform, dry_run=settings.USE_DRY_RUN_EXECUTION)
-    idem_key = f"budget-{execution_id}-{uuid.uuid4().hex[:8]}"
+    idem_key = f"budget-{execution_id}-{secrets.token_hex(4)}"
 
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     result = await adapter.update_budget(
         execution.external_campaign_id,
         new_budget,
         platform=Platform(execution.platform),
     )
-    duration_ms = int((time.monotonic() - start) * 1000)
+    duration_ms = (time.perf_counter_ns() - start) // 1_000_000
 
     action = ExecutionAction(
         execution_id=execution.id,
@@ -237,8 +219,7 @@ async def update_platform_budget(
         error_message=result.error,
         duration_ms=duration_ms,
     )
-    _db_session.add(action)
-    await _db_session.flush()
+    await persist_record(_db_session, action)
 
     return {
         "execution_id": execution_id,
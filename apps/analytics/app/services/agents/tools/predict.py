@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from decimal import Decimal
 from typing import Any
 
+import numpy as np
+
 from app.services.agents.tool_registry import ToolSpec
+from app.services.execution.channel_models import DEFAULT_CHANNEL_PARAMS_FLOAT
 
 PREDICT_SPEC = ToolSpec(
     name="predict_campaign_performance",
@@ -31,6 +33,9 @@ PREDICT_SPEC = ToolSpec(
         },
         "required": ["channels", "total_budget", "objective"],
     },
+    # Predictions depend only on the inputs and the static channel models.
+    cacheable=True,
+    cache_ttl_s=3600,
 )
 
 
@@ -41,23 +46,32 @@ async def predict_campaign_performance(
     **_kwargs: Any,
 ) -> dict[str, Any]:
     """Simple prediction using existing channel model parameters."""
-    from app.services.execution.channel_models import DEFAULT_CHANNEL_PARAMS
-
-    per_channel = Decimal(str(total_budget)) / max(len(channels), 1)
-    predictions: dict[str, Any] = {}
-    for ch in channels:
-        params = DEFAULT_CHANNEL_PARAMS.get(ch)
-        if params is None:
-            predictions[ch] = {"note": f"No model data for channel '{ch}'"}
-            continue
-        impressions = float((per_channel / params.base_cpm) * Decimal("1000"))
-        clicks = impressions * float(params.base_ctr)
-        conversions = clicks * float(params.base_cvr)
-        cac = float(per_channel) / max(conversions, 1)
-        predictions[ch] = {
-            "estimated_impressions": int(impressions),
-            "estimated_clicks": int(clicks),
-            "estimated_conversions": int(conversions),
-            "estimated_cac": round(cac, 2),
+    per_channel = float(total_budget) / max(len(channels), 1)
+    modeled = [ch for ch in channels if ch in DEFAULT_CHANNEL_PARAMS_FLOAT]
+    params = np.array([DEFAULT_CHANNEL_PARAMS_FLOAT[ch][:3] for ch in modeled]).reshape(-1, 3)
+
+    impressions = per_channel / params[:, 0] * 1000
+    clicks = impressions * params[:, 1]
+    conversions = clicks * params[:, 2]
+    cac = per_channel / np.maximum(conversions, 1)
+
+    estimates = {
+        ch: {
+            "estimated_impressions": est_impressions,
+            "estimated_clicks": est_clicks,
+            "estimated_conversions": est_conversions,
+            "estimated_cac": est_cac,
         }
+        for ch, est_impressions, est_clicks, est_conversions, est_cac in zip(
+            modeled,
+            impressions.astype(np.int64).tolist(),
+            clicks.astype(np.int64).tolist(),
+            conversions.astype(np.int64).tolist(),
+            np.round(cac, 2).tolist(),
+            strict=True,
+        )
+    }
+    predictions: dict[str, Any] = {
+        ch: estimates.get(ch) or {"note": f"No model data for channel '{ch}'"} for ch in channels
+    }
     return {"predictions": predictions, "total_budget": total_budget, "objective": objective}
@@ -40,35 +40,53 @@ async def query_past_campaigns(
     if _db_session is None:
         return {"campaigns": [], "note": "No database session available"}
 
-    from sqlalchemy import select
+    from sqlalchemy import func, select
 
     from app.models import Campaign, MeasurementReport
 
-    query = select(Campaign).order_by(Campaign.created_at.desc()).limit(limit)
+    # Only these columns are returned, so skip building Campaign entities.
+    query = (
+        select(Campaign.id, Campaign.name, Campaign.objective, Campaign.target_cac)
+        .order_by(Campaign.created_at.desc())
+        .limit(limit)
+    )
     if objective:
         query = query.where(Campaign.objective == objective)
 
     result = await _db_session.execute(query)
-    campaigns = result.scalars().all()
+    campaigns = result.all()
 
-    campaign_data = []
-    for campaign in campaigns:
+    # Latest report per campaign in one query instead of one query per campaign
+    latest_metrics: dict = {}
+    if campaigns:
+        ranked = (
+            select(
+                MeasurementReport.campaign_id,
+                MeasurementReport.metrics_json,
+                func.row_number()
+                .over(
+                    partition_by=MeasurementReport.campaign_id,
+                    order_by=MeasurementReport.created_at.desc(),
+                )
+                .label("rn"),
+            )
+            .where(MeasurementReport.campaign_id.in_([c.id for c in campaigns]))
+            .subquery()
+        )
         reports_result = await _db_session.execute(
-            select(MeasurementReport)
-            .where(MeasurementReport.campaign_id == campaign.id)
-            .order_by(MeasurementReport.created_at.desc())
-            .limit(1)
+            select(ranked.c.campaign_id, ranked.c.metrics_json).where(ranked.c.rn == 1)
         )
-        latest_report = reports_result.scalars().first()
+        latest_metrics = dict(reports_result.tuples().all())
 
-        campaign_data.append(
-            {
-                "id": str(campaign.id),
-                "name": campaign.name,
-                "objective": campaign.objective,
-                "target_cac": float(campaign.target_cac) if campaign.target_cac else None,
-                "latest_metrics": latest_report.metrics_json if latest_report else None,
-            }
-        )
+    campaign_data = [
+        {
+            "id": str(campaign_id),
+            "name": name,
+            "objective": campaign_objective,
+            "target_cac": float(target_cac) if target_cac else None,
+            "latest_metrics": latest_metrics.get(campaign_id),
+        }
+        for campaign_id, name, campaign_objective, target_cac in campaigns
+    ]
 
     return {"campaigns": campaign_data, "count": len(campaign_data)}
@@ -17,6 +17,8 @@ SEARCH_WEB_SPEC = ToolSpec(
         },
         "required": ["query"],
     },
+    cacheable=True,
+    cache_ttl_s=300,
 )
 
 
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any
 
+_D_ZERO = Decimal("0")
+_QUANT = Decimal("0.01")
+_MIN_CONVERSIONS = Decimal("5")
+_PAUSE_SPEND_FRAC = Decimal("0.10")
+_MIN_PAUSE_SPEND = Decimal("200")
+_MAX_MOVE_FRAC = Decimal("0.10")
+
 
 def _to_decimal(value: Any) -> Decimal:
     if value is None:
-        return Decimal("0")
+        return _D_ZERO
     if isinstance(value, Decimal):
         return value
     return Decimal(str(value))
@@ -20,22 +28,57 @@ def _safe_div(numerator: Decimal, denominator: Decimal) -> Decimal | None:
 
 
 def _quantize(value: Decimal) -> Decimal:
-    return value.quantize(Decimal("0.01"))
+    return value.quantize(_QUANT)
 
 
 def _normalize_allocations(
     allocations: dict[str, Decimal], total_budget: Decimal
 ) -> dict[str, Decimal]:
-    rounded = {k: _quantize(v) for k, v in allocations.items()}
-    current_total = sum(rounded.values())
-    remainder = total_budget - current_total
-    if rounded:
-        largest = max(rounded.items(), key=lambda item: (item[1], item[0]))[0]
-        rounded[largest] = _quantize(rounded[largest] + remainder)
+    rounded: dict[str, Decimal] = {}
+    current_total = _D_ZERO
+    largest: str | None = None
+    largest_value = _D_ZERO
+    for channel, value in allocations.items():
+        quantized = value.quantize(_QUANT)
+        rounded[channel] = quantized
+        current_total += quantized
+        # Ties go to the greatest channel name, as with max() over (value, name).
+        if (
+            largest is None
+            or quantized > largest_value
+            or (quantized == largest_value and channel > largest)
+        ):
+            largest, largest_value = channel, quantized
+    if largest is not None:
+        rounded[largest] = _quantize(rounded[largest] + total_budget - current_total)
     return rounded
 
 
-@dataclass(frozen=True)
+def _efficiency_score(kpis: dict[str, Any]) -> float:
+    # Scores only order channels, so float precision is enough.
+    efficiency = kpis.get("efficiency_index")
+    return float(efficiency) if efficiency is not None else 0.0
+
+
+def _revenue_score(kpis: dict[str, Any]) -> float:
+    roas = kpis.get("roas")
+    return _efficiency_score(kpis) + (float(roas) if roas is not None else 0.0)
+
+
+def _conversion_score(kpis: dict[str, Any]) -> float:
+    score = _efficiency_score(kpis)
+    cac = kpis.get("cac")
+    if cac is None or cac == 0:
+        return score
+    return score + 1.0 / float(cac)
+
+
+@functools.lru_cache(maxsize=32)
+def _cfg_decimals(max_delta: Any, floor: Any) -> tuple[Decimal, Decimal]:
+    return Decimal(str(max_delta)), Decimal(str(floor))
+
+
+@dataclass(frozen=True, slots=True)
 class AllocationDecisionResult:
     decision_type: str
     new_allocations: dict[str, Decimal]
@@ -47,17 +90,21 @@ def compute_allocation_decision(
     current_allocations: dict[str, Decimal],
     config: dict[str, Any],
 ) -> AllocationDecisionResult:
-    total_budget = sum(current_allocations.values())
-    max_delta_pct = Decimal(str(config.get("max_delta_pct_per_decision", 0.20)))
-    exploration_floor_pct = Decimal(str(config.get("exploration_floor_pct", 0.05)))
+    total_budget = sum(current_allocations.values(), _D_ZERO)
+    max_delta_pct, exploration_floor_pct = _cfg_decimals(
+        config.get("max_delta_pct_per_decision", 0.20),
+        config.get("exploration_floor_pct", 0.05),
+    )
     objective = config.get("objective", "paid_conversions")
+    # The objective is fixed for the decision, so pick the scorer once.
+    channel_score = _revenue_score if objective == "revenue" else _conversion_score
     target_cac = config.get("target_cac")
 
     totals = report.get("totals", {})
     total_spend = _to_decimal(totals.get("spend", 0))
     total_conversions = _to_decimal(totals.get("conversions", 0))
 
-    if total_spend == 0 or total_conversions < Decimal("5"):
+    if total_spend == 0 or total_conversions < _MIN_CONVERSIONS:
         rationale = {
             "rule": "insufficient_data",
             "total_spend": str(total_spend),
@@ -67,38 +114,38 @@ def compute_allocation_decision(
 
     by_channel = report.get("by_channel", [])
     channel_metrics: dict[str, dict[str, Any]] = {}
+    metrics_snapshot: dict[str, dict[str, Any]] = {}
     for entry in by_channel:
         channel = entry.get("channel")
         if channel is None:
             continue
         totals_entry = entry.get("totals", {})
         kpis_entry = entry.get("kpis", {})
+        spend = _to_decimal(totals_entry.get("spend", 0))
+        conversions = _to_decimal(totals_entry.get("conversions", 0))
+        # The decision reads only these; the KPIs go to metrics_snapshot.
         channel_metrics[channel] = {
-            "spend": _to_decimal(totals_entry.get("spend", 0)),
-            "conversions": _to_decimal(totals_entry.get("conversions", 0)),
+            "spend": spend,
+            "conversions": conversions,
+            "score": channel_score(kpis_entry),
+        }
+        metrics_snapshot[channel] = {
+            "spend": str(spend),
+            "conversions": str(conversions),
             "cac": kpis_entry.get("cac"),
             "roas": kpis_entry.get("roas"),
             "efficiency_index": kpis_entry.get("efficiency_index"),
         }
 
-    metrics_snapshot = {
-        channel: {
-            "spend": str(metrics["spend"]),
-            "conversions": str(metrics["conversions"]),
-            "cac": metrics["cac"],
-            "roas": metrics["roas"],
-            "efficiency_index": metrics["efficiency_index"],
-        }
-        for channel, metrics in channel_metrics.items()
-    }
-
     active_channels = [
         channel
         for channel, budget in current_allocations.items()
         if budget > 0 and channel in channel_metrics
     ]
+    if not active_channels:
+        return AllocationDecisionResult("hold", current_allocations, {"rule": "no_active"})
 
-    min_pause_spend = max(total_budget * Decimal("0.10"), Decimal("200"))
+    min_pause_spend = max(total_budget * _PAUSE_SPEND_FRAC, _MIN_PAUSE_SPEND)
     pause_candidates = [
         channel
         for channel in active_channels
@@ -110,35 +157,16 @@ def compute_allocation_decision(
     if pause_candidates and len(active_channels) - len(pause_candidates) >= 2:
         pause_channels = set(pause_candidates)
 
-    def score_channel(channel: str) -> Decimal:
-        metrics = channel_metrics[channel]
-        efficiency = metrics["efficiency_index"]
-        efficiency_score = Decimal(str(efficiency)) if efficiency is not None else Decimal("0")
-        if objective == "revenue":
-            roas = metrics["roas"]
-            roas_score = Decimal(str(roas)) if roas is not None else Decimal("0")
-            return roas_score + efficiency_score
-        cac = metrics["cac"]
-        if cac is None or cac == 0:
-            return efficiency_score
-        return efficiency_score + (Decimal("1") / Decimal(str(cac)))
-
-    ranked_channels = sorted(
-        active_channels,
-        key=lambda c: (score_channel(c), c),
-        reverse=True,
-    )
-
-    if not ranked_channels:
-        return AllocationDecisionResult("hold", current_allocations, {"rule": "no_active"})
+    scored = sorted(((channel_metrics[c]["score"], c) for c in active_channels), reverse=True)
+    ranked_channels = [channel for _, channel in scored]
 
     tier_size = max(1, len(ranked_channels) // 4)
     top_tier = ranked_channels[:tier_size]
     bottom_tier = ranked_channels[-tier_size:]
 
-    allocations = {k: v for k, v in current_allocations.items()}
+    allocations = current_allocations.copy()
     for channel in pause_channels:
-        allocations[channel] = Decimal("0")
+        allocations[channel] = _D_ZERO
 
     exploration_floor = total_budget * exploration_floor_pct
     reducible: dict[str, Decimal] = {}
@@ -146,9 +174,9 @@ def compute_allocation_decision(
         if channel in pause_channels:
             continue
         current = allocations[channel]
-        floor = exploration_floor if current > 0 else Decimal("0")
+        floor = exploration_floor if current > 0 else _D_ZERO
         max_reduce = current * max_delta_pct
-        reducible[channel] = max(Decimal("0"), min(max_reduce, current - floor))
+        reducible[channel] = max(_D_ZERO, min(max_reduce, current - floor))
 
     increasable: dict[str, Decimal] = {}
     for channel in top_tier:
@@ -156,9 +184,9 @@ def compute_allocation_decision(
         max_increase = current * max_delta_pct
         increasable[channel] = max_increase
 
-    total_reducible = sum(reducible.values())
-    total_increasable = sum(increasable.values())
-    move_amount = min(total_budget * Decimal("0.10"), total_reducible, total_increasable)
+    total_reducible = sum(reducible.values(), _D_ZERO)
+    total_increasable = sum(increasable.values(), _D_ZERO)
+    move_amount = min(total_budget * _MAX_MOVE_FRAC, total_reducible, total_increasable)
 
     rationale = {
         "objective": objective,
@@ -4,7 +4,7 @@ from datetime import date, timedelta
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app.models import (
@@ -20,6 +20,9 @@ from app.services.experimentation import run_experiment_window
 from app.services.measurement import compute_report
 from app.services.strategist import optimize_from_report
 
+# The simulator is stateless, so every window shares one instance.
+_SIM_AGENT = SimulatedExecutionAgent()
+
 
 def _to_decimal(value: Any) -> Decimal:
     if value is None:
@@ -29,55 +32,93 @@ def _to_decimal(value: Any) -> Decimal:
     return Decimal(str(value))
 
 
-def run_cycle(
-    db: Session,
-    campaign_id,
-    budget_plan_id,
-    window_start: date,
-    window_end: date,
-    seed: int,
-) -> dict[str, Any]:
-    campaign = db.get(Campaign, campaign_id)
-    if campaign is None:
-        raise ValueError("Campaign not found")
-
-    plan = (
-        db.execute(
-            select(CampaignPlan)
-            .where(CampaignPlan.campaign_id == campaign_id)
-            .order_by(CampaignPlan.created_at.desc())
-        )
-        .scalars()
-        .first()
+def _load_cycle_inputs(
+    db: Session, campaign_id, budget_plan_id
+) -> tuple[Campaign, CampaignPlan, CampaignBrief | None, BudgetPlan, dict[str, Decimal]]:
+    # Campaign plus its latest plan and brief in one round-trip instead of three.
+    latest_plan_id = (
+        select(CampaignPlan.id)
+        .where(CampaignPlan.campaign_id == campaign_id)
+        .order_by(CampaignPlan.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    latest_brief_id = (
+        select(CampaignBrief.id)
+        .where(CampaignBrief.campaign_id == campaign_id)
+        .order_by(CampaignBrief.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
     )
+    row = db.execute(
+        select(Campaign, CampaignPlan, CampaignBrief)
+        .outerjoin_from(Campaign, CampaignPlan, CampaignPlan.id == latest_plan_id)
+        .outerjoin_from(Campaign, CampaignBrief, CampaignBrief.id == latest_brief_id)
+        .where(Campaign.id == campaign_id)
+    ).one_or_none()
+    if row is None:
+        raise ValueError("Campaign not found")
+    campaign, plan, brief = row
     if plan is None:
         raise ValueError("Campaign plan not found")
 
-    brief = (
-        db.execute(
-            select(CampaignBrief)
-            .where(CampaignBrief.campaign_id == campaign_id)
-            .order_by(CampaignBrief.created_at.desc())
-        )
-        .scalars()
-        .first()
-    )
-
     budget_plan = db.get(BudgetPlan, budget_plan_id)
     if budget_plan is None:
         raise ValueError("Budget plan not found")
 
-    allocations_rows = (
-        db.execute(
-            select(ChannelBudget)
+    # Plain (channel, budget) tuples; the budget rows are only read here.
+    allocations = {
+        channel: _to_decimal(allocated_budget)
+        for channel, allocated_budget in db.execute(
+            select(ChannelBudget.channel, ChannelBudget.allocated_budget)
             .where(ChannelBudget.budget_plan_id == budget_plan_id)
             .order_by(ChannelBudget.channel)
         )
-        .scalars()
-        .all()
+    }
+    return campaign, plan, brief, budget_plan, allocations
+
+
+def run_cycle(
+    db: Session,
+    campaign_id,
+    budget_plan_id,
+    window_start: date,
+    window_end: date,
+    seed: int,
+) -> dict[str, Any]:
+    campaign, plan, brief, budget_plan, allocations = _load_cycle_inputs(
+        db, campaign_id, budget_plan_id
     )
-    allocations = {row.channel: _to_decimal(row.allocated_budget) for row in allocations_rows}
+    return _run_cycle_prepared(
+        db,
+        campaign_id=campaign_id,
+        budget_plan_id=budget_plan_id,
+        campaign=campaign,
+        plan_json=plan.plan_json,
+        brief_json=brief.brief_json if brief else None,
+        budget_plan=budget_plan,
+        allocations=allocations,
+        window_start=window_start,
+        window_end=window_end,
+        seed=seed,
+    )
+
 
+def _run_cycle_prepared(
+    db: Session,
+    *,
+    campaign_id,
+    budget_plan_id,
+    campaign: Campaign,
+    plan_json: dict[str, Any] | None,
+    brief_json: dict[str, Any] | None,
+    budget_plan: BudgetPlan,
+    allocations: dict[str, Decimal],
+    window_start: date,
+    window_end: date,
+    seed: int,
+) -> dict[str, Any]:
+    """Run one cycle from preloaded inputs; ``allocations`` is updated in place."""
     experiment_payload = run_experiment_window(
         db=db,
         campaign_id=campaign_id,
@@ -85,8 +126,8 @@ def run_cycle(
         window_start=window_start,
         window_end=window_end,
         seed=seed,
-        plan_json=plan.plan_json,
-        brief_json=brief.brief_json if brief else None,
+        plan_json=plan_json,
+        brief_json=brief_json,
     )
     if experiment_payload is not None:
         snapshots = experiment_payload["aggregated_snapshots"]
@@ -97,11 +138,10 @@ def run_cycle(
             "analysis": experiment_payload["analysis"],
         }
     else:
-        agent = SimulatedExecutionAgent()
-        snapshots = agent.run_window(
+        snapshots = _SIM_AGENT.run_window(
             campaign=campaign,
-            plan_json=plan.plan_json,
-            brief_json=brief.brief_json if brief else None,
+            plan_json=plan_json,
+            brief_json=brief_json,
             budget_plan=budget_plan,
             allocations=allocations,
             window_start=window_start,
@@ -110,24 +150,20 @@ def run_cycle(
         )
         experiment_info = None
 
-    for snapshot in snapshots:
-        db.add(
-            ChannelSnapshot(
-                campaign_id=campaign_id,
-                channel=snapshot["channel"],
-                window_start=snapshot["window_start"],
-                window_end=snapshot["window_end"],
-                spend=snapshot["spend"],
-                impressions=snapshot["impressions"],
-                clicks=snapshot["clicks"],
-                conversions=snapshot["conversions"],
-                revenue=snapshot["revenue"],
-            )
+    # Snapshot dict keys match ChannelSnapshot columns; one executemany INSERT
+    if snapshots:
+        db.execute(
+            insert(ChannelSnapshot),
+            [{"campaign_id": campaign_id, **snapshot} for snapshot in snapshots],
         )
-    db.commit()
 
+    # Snapshots, report, decision and budget updates share one transaction.
     report = compute_report(
-        db, campaign_id=campaign_id, window_start=window_start, window_end=window_end
+        db,
+        campaign_id=campaign_id,
+        window_start=window_start,
+        window_end=window_end,
+        commit=False,
     )
 
     decision_result = optimize_from_report(
@@ -135,6 +171,7 @@ def run_cycle(
         campaign_id=campaign_id,
         report_id=report.id,
         budget_plan_id=budget_plan_id,
+        commit=False,
     )
 
     totals = report.metrics_json.get("totals", {})
@@ -145,9 +182,11 @@ def run_cycle(
         "roas": report.metrics_json.get("kpis", {}).get("roas"),
     }
 
+    allocations.update(decision_result.to_allocations)
     allocations_after = {k: float(v) for k, v in decision_result.to_allocations.items()}
 
-    return {
+    # Read ids before the commit expires the instances.
+    cycle = {
         "snapshots": snapshots,
         "report_id": report.id,
         "decision_id": decision_result.decision.id,
@@ -156,6 +195,8 @@ def run_cycle(
         "metrics_summary": metrics_summary,
         "experiment": experiment_info,
     }
+    db.commit()
+    return cycle
 
 
 def run_cycles(
@@ -167,15 +208,28 @@ def run_cycles(
     window_days: int,
     seed: int,
 ) -> dict[str, Any]:
+    # Campaign, plan, brief and budget rows are read once; each cycle's decision
+    # carries its allocations forward to the next window.
+    campaign, plan, brief, budget_plan, allocations = _load_cycle_inputs(
+        db, campaign_id, budget_plan_id
+    )
+    plan_json = plan.plan_json
+    brief_json = brief.brief_json if brief else None
+
     cycles = []
     current_start = start_date
     for i in range(n):
         current_end = current_start + timedelta(days=window_days - 1)
         cycles.append(
-            run_cycle(
+            _run_cycle_prepared(
                 db,
                 campaign_id=campaign_id,
                 budget_plan_id=budget_plan_id,
+                campaign=campaign,
+                plan_json=plan_json,
+                brief_json=brief_json,
+                budget_plan=budget_plan,
+                allocations=allocations,
                 window_start=current_start,
                 window_end=current_end,
                 seed=seed + i,
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from decimal import Decimal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChannelParams:
     base_cpm: Decimal
     base_ctr: Decimal
@@ -84,3 +84,18 @@ DEFAULT_CHANNEL_PARAMS: dict[str, ChannelParams] = {
         noise_sigma=Decimal("0.1"),
     ),
 }
+
+# (base_cpm, base_ctr, base_cvr, base_aov, diminishing_k, spend_scale, noise_sigma)
+# as floats, for callers that estimate in plain float arithmetic.
+DEFAULT_CHANNEL_PARAMS_FLOAT: dict[str, tuple[float, float, float, float, float, float, float]] = {
+    channel: (
+        float(params.base_cpm),
+        float(params.base_ctr),
+        float(params.base_cvr),
+        float(params.base_aov),
+        float(params.diminishing_k),
+        float(params.spend_scale),
+        float(params.noise_sigma),
+    )
+    for channel, params in DEFAULT_CHANNEL_PARAMS.items()
+}
@@ -1,39 +1,117 @@
 from __future__ import annotations
 
-import random
+import functools
+from collections.abc import Callable
 from datetime import date
 from decimal import Decimal
 from typing import Any
 
+import numpy as np
+
 from app.services.execution.base import ExecutionAgent
 from app.services.execution.channel_models import DEFAULT_CHANNEL_PARAMS, ChannelParams
 
-
-def _to_decimal(value: Any) -> Decimal:
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+
+    def njit(*args: Any, **kwargs: Any) -> Callable[[Any], Any]:
+        return lambda func: func
+
+
+_FALLBACK_PARAMS = ChannelParams(
+    base_cpm=Decimal("15"),
+    base_ctr=Decimal("0.01"),
+    base_cvr=Decimal("0.02"),
+    base_aov=Decimal("65"),
+    diminishing_k=Decimal("0.4"),
+    spend_scale=Decimal("8000"),
+    noise_sigma=Decimal("0.08"),
+)
+
+# Column layout of _PARAM_TABLE.
+_CPM, _CTR, _CVR, _AOV, _K, _SCALE, _SIGMA, _HIT_RATE, _HIT_MULT = range(9)
+
+
+def _param_row(params: ChannelParams) -> list[float]:
+    # The kernel divides by CPM, so every channel must price impressions.
+    if params.base_cpm <= 0:
+        raise ValueError(f"base_cpm must be positive, got {params.base_cpm}")
+    # NaN hit rate marks a channel without the influencer hit/miss draw.
+    return [
+        float(params.base_cpm),
+        float(params.base_ctr),
+        float(params.base_cvr),
+        float(params.base_aov),
+        float(params.diminishing_k),
+        float(params.spend_scale) if params.spend_scale > 0 else 1.0,
+        float(params.noise_sigma),
+        float("nan") if params.influencer_hit_rate is None else float(params.influencer_hit_rate),
+        1.0 if params.influencer_multiplier is None else float(params.influencer_multiplier),
+    ]
+
+
+_CHANNEL_ROWS = {channel: row for row, channel in enumerate(DEFAULT_CHANNEL_PARAMS)}
+_FALLBACK_ROW = len(_CHANNEL_ROWS)
+_PARAM_TABLE = np.array(
+    [_param_row(params) for params in (*DEFAULT_CHANNEL_PARAMS.values(), _FALLBACK_PARAMS)],
+    dtype=np.float64,
+)
+
+
+_ZERO_SNAPSHOT: dict[str, Any] = {
+    "spend": Decimal("0.00"),
+    "impressions": 0,
+    "clicks": 0,
+    "conversions": 0,
+    "revenue": Decimal("0.00"),
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _channel_table(channels: tuple[str, ...]) -> np.ndarray:
+    """Parameter rows for ``channels``; experiment variants reuse one channel set."""
+    table = _PARAM_TABLE[[_CHANNEL_ROWS.get(channel, _FALLBACK_ROW) for channel in channels]]
+    table.flags.writeable = False
+    return table
+
+
+def _to_float(value: Any) -> float:
     if value is None:
-        return Decimal("0")
-    if isinstance(value, Decimal):
-        return value
-    return Decimal(str(value))
-
-
-def _clamp(value: Decimal, minimum: Decimal) -> Decimal:
-    if value < minimum:
-        return minimum
-    return value
-
-
-def _effective_rate(base: Decimal, spend: Decimal, params: ChannelParams) -> Decimal:
-    scale = params.spend_scale if params.spend_scale > 0 else Decimal("1")
-    factor = Decimal("1") / (Decimal("1") + params.diminishing_k * (spend / scale))
-    return base * factor
-
-
-def _apply_noise(rng: random.Random, value: Decimal, sigma: Decimal) -> Decimal:
-    if sigma <= 0:
-        return value
-    noise = Decimal(str(rng.normalvariate(0, float(sigma))))
-    return _clamp(value * (Decimal("1") + noise), Decimal("0"))
+        return 0.0
+    return float(value)
+
+
+def _to_cents(value: float) -> Decimal:
+    return Decimal(f"{value:.2f}")
+
+
+@njit(cache=True)
+def _simulate_channels(
+    spend: np.ndarray,
+    table: np.ndarray,
+    mults: np.ndarray,
+    ctr_noise: np.ndarray,
+    cvr_noise: np.ndarray,
+    aov_noise: np.ndarray,
+    hits: np.ndarray,
+    compute_revenue: bool,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return impressions, clicks, conversions and revenue per channel row."""
+    factor = 1.0 / (1.0 + table[:, _K] * (spend / table[:, _SCALE]))
+    effective_ctr = np.maximum(table[:, _CTR] * mults[:, 0] * factor * (1.0 + ctr_noise), 0.0)
+    effective_cvr = np.maximum(table[:, _CVR] * mults[:, 1] * factor * (1.0 + cvr_noise), 0.0)
+
+    impressions = spend / table[:, _CPM] * 1000.0
+    clicks = impressions * effective_ctr
+    conversions = np.where(hits, clicks * effective_cvr * table[:, _HIT_MULT], 0.0)
+
+    if compute_revenue:
+        aov = np.maximum(table[:, _AOV] * mults[:, 2] * (1.0 + aov_noise), 0.0)
+        revenue = conversions * aov
+    else:
+        revenue = np.zeros_like(spend)
+    return impressions, clicks, conversions, revenue
 
 
 class SimulatedExecutionAgent(ExecutionAgent):
@@ -51,7 +129,6 @@ class SimulatedExecutionAgent(ExecutionAgent):
         variant_name: str | None = None,
         sim_overrides: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
-        rng = random.Random(seed)
         objective = getattr(campaign, "objective", "paid_conversions")
         plan_start = getattr(budget_plan, "start_date", None)
         plan_end = getattr(budget_plan, "end_date", None)
@@ -62,74 +139,79 @@ class SimulatedExecutionAgent(ExecutionAgent):
         window_days = (window_end - window_start).days + 1
         if window_days <= 0:
             window_days = 1
-
-        snapshots: list[dict[str, Any]] = []
-        for channel, allocation in allocations.items():
-            params = DEFAULT_CHANNEL_PARAMS.get(channel)
-            if params is None:
-                params = ChannelParams(
-                    base_cpm=Decimal("15"),
-                    base_ctr=Decimal("0.01"),
-                    base_cvr=Decimal("0.02"),
-                    base_aov=Decimal("65"),
-                    diminishing_k=Decimal("0.4"),
-                    spend_scale=Decimal("8000"),
-                    noise_sigma=Decimal("0.08"),
-                )
-
-            allocated = _to_decimal(allocation)
-            if plan_days:
-                spend = allocated * Decimal(window_days) / Decimal(plan_days)
-            else:
-                spend = allocated
-
-            spend = _clamp(spend, Decimal("0"))
-            overrides = (sim_overrides or {}).get(channel, {})
-            ctr_mult = _to_decimal(overrides.get("ctr_mult", 1))
-            cvr_mult = _to_decimal(overrides.get("cvr_mult", 1))
-            aov_mult = _to_decimal(overrides.get("aov_mult", 1))
-
-            base_ctr = params.base_ctr * ctr_mult
-            base_cvr = params.base_cvr * cvr_mult
-
-            effective_ctr = _effective_rate(base_ctr, spend, params)
-            effective_cvr = _effective_rate(base_cvr, spend, params)
-
-            effective_ctr = _apply_noise(rng, effective_ctr, params.noise_sigma)
-            effective_cvr = _apply_noise(rng, effective_cvr, params.noise_sigma)
-
-            impressions = Decimal("0")
-            if params.base_cpm > 0:
-                impressions = (spend / params.base_cpm) * Decimal("1000")
-            impressions = max(Decimal("0"), impressions)
-
-            clicks = impressions * effective_ctr
-            conversions = clicks * effective_cvr
-
-            if params.influencer_hit_rate is not None:
-                hit = rng.random() < float(params.influencer_hit_rate)
-                if hit and params.influencer_multiplier is not None:
-                    conversions = conversions * params.influencer_multiplier
-                if not hit:
-                    conversions = Decimal("0")
-
-            if objective == "revenue" or (brief_json and brief_json.get("revenue_tracking")):
-                aov = _apply_noise(rng, params.base_aov * aov_mult, Decimal("0.05"))
-                revenue = conversions * aov
-            else:
-                revenue = Decimal("0")
-
-            snapshots.append(
+        window_share = window_days / plan_days if plan_days else 1.0
+
+        channels = tuple(allocations)
+        if not channels:
+            return []
+        n = len(channels)
+        table = _channel_table(channels)
+
+        spend = np.array([_to_float(allocations[channel]) for channel in channels])
+        spend = np.maximum(spend * window_share, 0.0)
+        if not spend.any():
+            return [
                 {
                     "channel": channel,
                     "window_start": window_start,
                     "window_end": window_end,
-                    "spend": spend.quantize(Decimal("0.01")),
-                    "impressions": int(impressions.to_integral_value()),
-                    "clicks": int(clicks.to_integral_value()),
-                    "conversions": int(conversions.to_integral_value()),
-                    "revenue": revenue.quantize(Decimal("0.01")),
+                    **_ZERO_SNAPSHOT,
                 }
+                for channel in channels
+            ]
+
+        overrides_all = sim_overrides or {}
+        mults = np.ones((n, 3))
+        if overrides_all:
+            for i, channel in enumerate(channels):
+                overrides = overrides_all.get(channel)
+                if overrides:
+                    mults[i] = [
+                        _to_float(overrides.get(key, 1))
+                        for key in ("ctr_mult", "cvr_mult", "aov_mult")
+                    ]
+        compute_revenue = objective == "revenue" or bool(
+            brief_json and brief_json.get("revenue_tracking")
+        )
+
+        # default_rng rejects negative seeds; fold them the way random.Random does.
+        gen = np.random.default_rng(abs(seed))
+        sigma = np.maximum(table[:, _SIGMA], 0.0)
+        ctr_noise = gen.normal(0.0, 1.0, n) * sigma
+        cvr_noise = gen.normal(0.0, 1.0, n) * sigma
+        hit_rate = table[:, _HIT_RATE]
+        hits = np.isnan(hit_rate) | (gen.random(n) < hit_rate)
+        aov_noise = gen.normal(0.0, 0.05, n) if compute_revenue else np.zeros(n)
+
+        impressions, clicks, conversions, revenue = _simulate_channels(
+            spend, table, mults, ctr_noise, cvr_noise, aov_noise, hits, compute_revenue
+        )
+        # Counts round half to even, as the Decimal to_integral_value path did.
+        counts = np.rint(np.stack((impressions, clicks, conversions))).astype(np.int64).tolist()
+
+        return [
+            {
+                "channel": channel,
+                "window_start": window_start,
+                "window_end": window_end,
+                "spend": _to_cents(channel_spend),
+                "impressions": channel_impressions,
+                "clicks": channel_clicks,
+                "conversions": channel_conversions,
+                "revenue": _to_cents(channel_revenue),
+            }
+            for (
+                channel,
+                channel_spend,
+                channel_impressions,
+                channel_clicks,
+                channel_conversions,
+                channel_revenue,
+            ) in zip(
+                channels,
+                spend.tolist(),
+                *counts,
+                revenue.tolist(),
+                strict=True,
             )
-
-        return snapshots
+        ]
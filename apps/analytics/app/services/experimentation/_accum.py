@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    njit = None
+
+
+def _reduce_snapshots_loop(
+    variant_ids: np.ndarray,
+    channel_ids: np.ndarray,
+    values: np.ndarray,
+    n_variants: int,
+    n_channels: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    variant_sums = np.zeros((n_variants, values.shape[1]), dtype=np.int64)
+    channel_sums = np.zeros((n_channels, values.shape[1]), dtype=np.int64)
+    for row in range(values.shape[0]):
+        variant_sums[variant_ids[row]] += values[row]
+        channel_sums[channel_ids[row]] += values[row]
+    return variant_sums, channel_sums
+
+
+def _reduce_snapshots_numpy(
+    variant_ids: np.ndarray,
+    channel_ids: np.ndarray,
+    values: np.ndarray,
+    n_variants: int,
+    n_channels: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    variant_sums = np.zeros((n_variants, values.shape[1]), dtype=np.int64)
+    channel_sums = np.zeros((n_channels, values.shape[1]), dtype=np.int64)
+    np.add.at(variant_sums, variant_ids, values)
+    np.add.at(channel_sums, channel_ids, values)
+    return variant_sums, channel_sums
+
+
+# Sum int64 snapshot rows per variant and per channel in one pass. Compiled
+# to native code when numba is installed; otherwise a vectorized NumPy path.
+if njit is not None:
+    reduce_snapshots = njit(cache=True, nogil=True)(_reduce_snapshots_loop)
+else:
+    reduce_snapshots = _reduce_snapshots_numpy
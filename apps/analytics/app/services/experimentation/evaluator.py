@@ -2,80 +2,136 @@ from __future__ import annotations
 
 import math
 import uuid
+from collections import defaultdict
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
-from app.models import Experiment, ExperimentResult
+from app.models import Experiment, ExperimentResult, ExperimentRollup
+
+_ZERO = Decimal("0")
+_SQRT2 = math.sqrt(2.0)
+_HISTORY_TOTALS_SQL = text(
+    """
+    SELECT
+        v.key,
+        COALESCE(SUM((v.value -> 'totals' ->> 'clicks')::bigint), 0)::bigint,
+        COALESCE(SUM((v.value -> 'totals' ->> 'conversions')::bigint), 0)::bigint,
+        COALESCE(SUM(ROUND((v.value -> 'totals' ->> 'spend')::numeric * 100)), 0)::bigint
+    FROM experiment_results AS er
+    CROSS JOIN LATERAL jsonb_each(er.results_json -> 'variants') AS v
+    WHERE er.experiment_id = :experiment_id
+    GROUP BY v.key
+    ORDER BY v.key
+    """
+)
 
 
 def _to_decimal(value: Any) -> Decimal:
     if value is None:
-        return Decimal("0")
+        return _ZERO
     if isinstance(value, Decimal):
         return value
+    if isinstance(value, int):
+        return Decimal(value)
     return Decimal(str(value))
 
 
-def _normal_cdf(x: float) -> float:
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+def _to_cents(value: Any) -> int:
+    return int(_to_decimal(value).scaleb(2).to_integral_value())
 
 
 def _z_test(p1: float, p2: float, n1: int, n2: int) -> float:
-    if n1 == 0 or n2 == 0:
+    if n1 <= 0 or n2 <= 0:
         return 1.0
-    pooled = ((p1 * n1) + (p2 * n2)) / (n1 + n2)
-    if pooled in (0, 1):
+    pooled = (p1 * n1 + p2 * n2) / (n1 + n2)
+    # pooled * (1 - pooled) * (1/n1 + 1/n2), with the harmonic term folded in.
+    variance = pooled * (1.0 - pooled) * (n1 + n2) / (n1 * n2)
+    if variance <= 0.0:
         return 1.0
-    se = math.sqrt(pooled * (1 - pooled) * (1 / n1 + 1 / n2))
-    if se == 0:
-        return 1.0
-    z = (p1 - p2) / se
-    p_value = 2 * (1 - _normal_cdf(abs(z)))
-    return p_value
+    z_abs = abs(p1 - p2) / math.sqrt(variance)
+    # Two-sided p-value 2 * (1 - Phi(|z|)); erfc keeps precision in the tail.
+    return math.erfc(z_abs / _SQRT2)
 
 
-def evaluate_if_ready(db: Session, experiment_id: uuid.UUID) -> dict[str, Any] | None:
-    experiment = db.get(Experiment, experiment_id)
-    if experiment is None:
-        return None
+def _store_analysis(
+    db: Session, experiment: Experiment, latest: ExperimentResult, analysis: dict[str, Any]
+) -> None:
+    latest.analysis_json = analysis
+    experiment.last_analyzed_result_id = latest.id
+    db.commit()
 
-    results = (
-        db.execute(
-            select(ExperimentResult)
-            .where(ExperimentResult.experiment_id == experiment_id)
-            .order_by(ExperimentResult.window_start.asc())
-        )
-        .scalars()
-        .all()
-    )
-    if not results:
-        return None
 
-    variants = {}
-    for result in results:
-        res_variants = result.results_json.get("variants", {})
+def sum_result_history(db: Session, experiment_id: uuid.UUID) -> dict[str, dict[str, int]]:
+    """Per-variant clicks, conversions and spend cents summed over every stored window."""
+    if db.get_bind().dialect.name == "postgresql":
+        # Sum inside Postgres so only one row per variant crosses the wire.
+        return {
+            name: {"clicks": clicks, "conversions": conversions, "spend_cents": spend_cents}
+            for name, clicks, conversions, spend_cents in db.execute(
+                _HISTORY_TOTALS_SQL, {"experiment_id": experiment_id}
+            )
+        }
+
+    results_payloads = db.execute(
+        select(ExperimentResult.results_json)
+        .where(ExperimentResult.experiment_id == experiment_id)
+        .order_by(ExperimentResult.window_start.asc())
+    ).scalars()
+
+    # The factory only builds a zeroed entry for a variant's first window.
+    variants: defaultdict[str, dict[str, int]] = defaultdict(
+        lambda: {"clicks": 0, "conversions": 0, "spend_cents": 0}
+    )
+    for results_json in results_payloads:
+        res_variants = results_json.get("variants", {})
         for name, payload in res_variants.items():
             totals = payload.get("totals", {})
-            variants.setdefault(name, {"clicks": 0, "conversions": 0, "spend": Decimal("0")})
-            variants[name]["clicks"] += int(totals.get("clicks", 0))
-            variants[name]["conversions"] += int(totals.get("conversions", 0))
-            variants[name]["spend"] += _to_decimal(totals.get("spend", 0))
-
+            stats = variants[name]
+            stats["clicks"] += int(totals.get("clicks", 0))
+            stats["conversions"] += int(totals.get("conversions", 0))
+            stats["spend_cents"] += _to_cents(totals.get("spend", 0))
+    return dict(variants)
+
+
+def load_variant_totals(db: Session, experiment_id: uuid.UUID) -> dict[str, dict[str, int]]:
+    """Cumulative per-variant clicks, conversions and spend cents for an experiment."""
+    variants = {
+        name: {"clicks": clicks, "conversions": conversions, "spend_cents": spend_cents}
+        for name, clicks, conversions, spend_cents in db.execute(
+            select(
+                ExperimentRollup.variant_name,
+                ExperimentRollup.clicks,
+                ExperimentRollup.conversions,
+                ExperimentRollup.spend_cents,
+            )
+            .where(ExperimentRollup.experiment_id == experiment_id)
+            .order_by(ExperimentRollup.variant_name)
+        )
+    }
+    if not variants:
+        # Experiments whose windows predate the rollup table.
+        variants = sum_result_history(db, experiment_id)
+    return variants
+
+
+def analyze_experiment(
+    experiment: Experiment, variants: dict[str, dict[str, int]]
+) -> dict[str, Any]:
+    """Analysis of cumulative variant totals; marks the experiment completed on a winner."""
+    # Numeric column: convert from Decimal once rather than at each use.
+    confidence = float(experiment.confidence)
     if len(variants) != 2:
-        analysis = {
+        return {
             "ready": False,
             "primary_metric": experiment.primary_metric,
             "decision": "inconclusive",
             "winner": None,
-            "confidence": float(experiment.confidence),
+            "confidence": confidence,
             "notes": ["not_supported_multi_variant"],
         }
-        results[-1].analysis_json = analysis
-        db.commit()
-        return analysis
 
     names = sorted(variants.keys())
     a, b = names[0], names[1]
@@ -90,7 +146,7 @@ def evaluate_if_ready(db: Session, experiment_id: uuid.UUID) -> dict[str, Any] |
         name: {
             "clicks": stats["clicks"],
             "conversions": stats["conversions"],
-            "spend": float(stats["spend"]),
+            "spend": stats["spend_cents"] / 100,
         }
         for name, stats in variants.items()
     }
@@ -101,20 +157,16 @@ def evaluate_if_ready(db: Session, experiment_id: uuid.UUID) -> dict[str, Any] |
         "variant_stats": variant_stats,
         "winner": None,
         "decision": "continue",
-        "confidence": float(experiment.confidence),
+        "confidence": confidence,
         "notes": [],
     }
 
     if not ready:
-        results[-1].analysis_json = analysis
-        db.commit()
         return analysis
 
     if experiment.primary_metric != "cvr":
         analysis["decision"] = "inconclusive"
         analysis["notes"].append("metric_not_supported_v1")
-        results[-1].analysis_json = analysis
-        db.commit()
         return analysis
 
     p1 = variants[a]["conversions"] / max(1, variants[a]["clicks"])
@@ -129,7 +181,7 @@ def evaluate_if_ready(db: Session, experiment_id: uuid.UUID) -> dict[str, Any] |
         }
     )
 
-    alpha = 1 - float(experiment.confidence)
+    alpha = 1 - confidence
     if p_value <= alpha:
         winner = b if p2 > p1 else a
         analysis["winner"] = winner
@@ -138,6 +190,28 @@ def evaluate_if_ready(db: Session, experiment_id: uuid.UUID) -> dict[str, Any] |
     else:
         analysis["decision"] = "inconclusive"
 
-    results[-1].analysis_json = analysis
-    db.commit()
+    return analysis
+
+
+def evaluate_if_ready(db: Session, experiment_id: uuid.UUID) -> dict[str, Any] | None:
+    experiment = db.get(Experiment, experiment_id)
+    if experiment is None:
+        return None
+
+    # The analysis is written onto the latest window's result row. If that row
+    # was already analyzed, no window has arrived since and its analysis stands.
+    latest_row = db.execute(
+        select(ExperimentResult.id, ExperimentResult.analysis_json)
+        .where(ExperimentResult.experiment_id == experiment_id)
+        .order_by(ExperimentResult.window_start.desc())
+        .limit(1)
+    ).first()
+    if latest_row is None:
+        return None
+    if latest_row.id == experiment.last_analyzed_result_id:
+        return latest_row.analysis_json
+    latest = db.get(ExperimentResult, latest_row.id)
+
+    analysis = analyze_experiment(experiment, load_variant_totals(db, experiment_id))
+    _store_analysis(db, experiment, latest, analysis)
     return analysis
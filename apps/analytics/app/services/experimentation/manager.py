@@ -1,62 +1,79 @@
 from __future__ import annotations
 
+import functools
 import hashlib
+import uuid
 from datetime import date
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, selectinload
 
 from app.models import (
     BudgetPlan,
     Campaign,
-    ChannelBudget,
     Experiment,
     ExperimentResult,
+    ExperimentRollup,
     ExperimentVariant,
 )
-from app.services.experimentation.evaluator import evaluate_if_ready
+from app.services.experimentation._accum import reduce_snapshots
+from app.services.experimentation.evaluator import (
+    analyze_experiment,
+    evaluate_if_ready,
+    load_variant_totals,
+    sum_result_history,
+)
 from app.services.experimentation.splitter import split_allocations
 from app.services.execution import SimulatedExecutionAgent
 
+# The simulator is stateless, so every variant and window shares one instance.
+_SIM_AGENT = SimulatedExecutionAgent()
+_ZERO = Decimal("0")
+_ROLLUP_FIELDS = ("clicks", "conversions", "spend_cents")
+_TOTAL_FIELDS = ("spend_cents", "impressions", "clicks", "conversions", "revenue_cents")
+
 
 def _to_decimal(value: Any) -> Decimal:
     if value is None:
-        return Decimal("0")
+        return _ZERO
     if isinstance(value, Decimal):
         return value
+    if isinstance(value, int):
+        return Decimal(value)
     return Decimal(str(value))
 
 
-def _stable_hash_int(value: str) -> int:
-    digest = hashlib.sha256(value.encode("utf-8")).hexdigest()
-    return int(digest[:8], 16)
+def _to_cents(value: Any) -> int:
+    return int(_to_decimal(value).scaleb(2).to_integral_value())
 
 
-def _safe_div(numerator: Decimal, denominator: Decimal) -> Decimal | None:
-    if denominator == 0:
-        return None
-    return numerator / denominator
+def _from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
 
 
-def compute_kpis(totals: dict[str, Any]) -> dict[str, Any]:
-    spend = _to_decimal(totals.get("spend", 0))
-    impressions = Decimal(str(totals.get("impressions", 0)))
-    clicks = Decimal(str(totals.get("clicks", 0)))
-    conversions = Decimal(str(totals.get("conversions", 0)))
-    revenue = _to_decimal(totals.get("revenue", 0))
+@functools.lru_cache(maxsize=256)
+def _stable_hash_int(value: str) -> int:
+    # 32 bits of seed entropy per variant name; names repeat every window.
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "big")
+
 
+def _kpis_from_cents(
+    spend_cents: int, revenue_cents: int, impressions: int, clicks: int, conversions: int
+) -> dict[str, Any]:
+    # Money stays in integer cents so every KPI is a single correctly rounded
+    # int / int division, with no Decimal arithmetic.
+    has_spend = spend_cents > 0
     return {
-        "ctr": float(_safe_div(clicks, impressions)) if impressions > 0 else None,
-        "cvr": float(_safe_div(conversions, clicks)) if clicks > 0 else None,
-        "cpc": float(_safe_div(spend, clicks)) if clicks > 0 else None,
-        "cpm": float(_safe_div(spend * Decimal("1000"), impressions))
-        if impressions > 0
-        else None,
-        "cac": float(_safe_div(spend, conversions)) if conversions > 0 else None,
-        "roas": float(_safe_div(revenue, spend)) if spend > 0 else None,
-        "conversions_per_dollar": float(_safe_div(conversions, spend)) if spend > 0 else None,
+        "ctr": clicks / impressions if impressions > 0 else None,
+        "cvr": conversions / clicks if clicks > 0 else None,
+        "cpc": spend_cents / (100 * clicks) if clicks > 0 else None,
+        "cpm": spend_cents * 10 / impressions if impressions > 0 else None,
+        "cac": spend_cents / (100 * conversions) if conversions > 0 else None,
+        "roas": revenue_cents / spend_cents if has_spend else None,
+        "conversions_per_dollar": conversions * 100 / spend_cents if has_spend else None,
     }
 
 
@@ -86,15 +103,18 @@ def create_experiment(
     db.add(experiment)
     db.flush()
 
-    for variant in variants:
-        db.add(
-            ExperimentVariant(
-                experiment_id=experiment.id,
-                name=variant["name"],
-                traffic_share=_to_decimal(variant["traffic_share"]),
-                variant_json=variant["variant"],
-            )
-        )
+    db.execute(
+        insert(ExperimentVariant),
+        [
+            {
+                "experiment_id": experiment.id,
+                "name": variant["name"],
+                "traffic_share": _to_decimal(variant["traffic_share"]),
+                "variant_json": variant["variant"],
+            }
+            for variant in variants
+        ],
+    )
 
     db.commit()
     db.refresh(experiment)
@@ -149,6 +169,50 @@ def stop_experiment(db: Session, experiment_id, reason: str | None = None) -> Ex
     return experiment
 
 
+def _accumulate_rollups(
+    db: Session, experiment_id, window_stats: dict[str, dict[str, int]]
+) -> None:
+    """Add one window's per-variant totals to the experiment's cumulative rollup rows."""
+    seeded = (
+        db.execute(
+            select(ExperimentRollup.id)
+            .where(ExperimentRollup.experiment_id == experiment_id)
+            .limit(1)
+        ).first()
+        is not None
+    )
+    if seeded:
+        new_stats = window_stats
+    else:
+        # First window since the rollup table existed: seed it from stored history.
+        new_stats = sum_result_history(db, experiment_id)
+        for name, stats in window_stats.items():
+            totals = new_stats.setdefault(name, dict.fromkeys(_ROLLUP_FIELDS, 0))
+            for field in _ROLLUP_FIELDS:
+                totals[field] += stats[field]
+    if not new_stats:
+        return
+
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+    # One upsert adds to existing variants and creates rows for new ones.
+    table = ExperimentRollup.__table__
+    stmt = upsert(table)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["experiment_id", "variant_name"],
+            set_={field: table.c[field] + stmt.excluded[field] for field in _ROLLUP_FIELDS},
+        ),
+        [
+            {"experiment_id": experiment_id, "variant_name": name, **stats}
+            for name, stats in new_stats.items()
+        ],
+    )
+
+
 def run_experiment_window(
     db: Session,
     campaign_id,
@@ -162,6 +226,7 @@ def run_experiment_window(
     experiment = (
         db.execute(
             select(Experiment)
+            .options(selectinload(Experiment.variants))
             .where(Experiment.campaign_id == campaign_id)
             .where(Experiment.status == "running")
         )
@@ -172,37 +237,32 @@ def run_experiment_window(
         return None
 
     campaign = db.get(Campaign, campaign_id)
-    budget_plan = db.get(BudgetPlan, budget_plan_id)
+    budget_plan = db.get(
+        BudgetPlan, budget_plan_id, options=[selectinload(BudgetPlan.channel_budgets)]
+    )
     if campaign is None or budget_plan is None:
         raise ValueError("Campaign or budget plan not found")
 
-    variants = (
-        db.execute(
-            select(ExperimentVariant).where(ExperimentVariant.experiment_id == experiment.id)
-        )
-        .scalars()
-        .all()
-    )
+    variants = experiment.variants
     variant_shares = {variant.name: _to_decimal(variant.traffic_share) for variant in variants}
 
     channel_budgets = {
-        row.channel: _to_decimal(row.allocated_budget)
-        for row in db.execute(
-            select(ChannelBudget).where(ChannelBudget.budget_plan_id == budget_plan_id)
-        ).scalars()
+        row.channel: _to_decimal(row.allocated_budget) for row in budget_plan.channel_budgets
     }
 
     per_variant_allocations = split_allocations(channel_budgets, variant_shares)
 
-    agent = SimulatedExecutionAgent()
-    variant_results: dict[str, Any] = {}
-    aggregated: dict[str, dict[str, Decimal]] = {}
+    # Snapshot rows for every variant, column-wise: variant index, channel and
+    # a row of _TOTAL_FIELDS per snapshot, money in cents.
+    row_variants: list[int] = []
+    row_channels: list[str] = []
+    row_values: list[tuple[int, int, int, int, int]] = []
 
-    for variant in variants:
+    for variant_index, variant in enumerate(variants):
         variant_payload = variant.variant_json or {}
         overrides = variant_payload.get("sim_overrides", {})
         variant_seed = seed + _stable_hash_int(variant.name) * 1000
-        snapshots = agent.run_window(
+        snapshots = _SIM_AGENT.run_window(
             campaign=campaign,
             plan_json=plan_json,
             brief_json=brief_json,
@@ -214,47 +274,48 @@ def run_experiment_window(
             variant_name=variant.name,
             sim_overrides=overrides,
         )
-
-        totals = {
-            "spend": Decimal("0"),
-            "impressions": 0,
-            "clicks": 0,
-            "conversions": 0,
-            "revenue": Decimal("0"),
-        }
         for snapshot in snapshots:
-            totals["spend"] += _to_decimal(snapshot["spend"])
-            totals["impressions"] += int(snapshot["impressions"])
-            totals["clicks"] += int(snapshot["clicks"])
-            totals["conversions"] += int(snapshot["conversions"])
-            totals["revenue"] += _to_decimal(snapshot["revenue"])
-
-            channel = snapshot["channel"]
-            bucket = aggregated.setdefault(
-                channel,
-                {
-                    "spend": Decimal("0"),
-                    "impressions": 0,
-                    "clicks": 0,
-                    "conversions": 0,
-                    "revenue": Decimal("0"),
-                },
+            row_variants.append(variant_index)
+            row_channels.append(snapshot["channel"])
+            row_values.append(
+                (
+                    _to_cents(snapshot["spend"]),
+                    int(snapshot["impressions"]),
+                    int(snapshot["clicks"]),
+                    int(snapshot["conversions"]),
+                    _to_cents(snapshot["revenue"]),
+                )
             )
-            bucket["spend"] += _to_decimal(snapshot["spend"])
-            bucket["impressions"] += int(snapshot["impressions"])
-            bucket["clicks"] += int(snapshot["clicks"])
-            bucket["conversions"] += int(snapshot["conversions"])
-            bucket["revenue"] += _to_decimal(snapshot["revenue"])
 
+    channels = sorted(set(row_channels))
+    channel_index = {channel: index for index, channel in enumerate(channels)}
+    variant_sums, channel_sums = reduce_snapshots(
+        np.array(row_variants, dtype=np.int64),
+        np.array([channel_index[channel] for channel in row_channels], dtype=np.int64),
+        np.array(row_values, dtype=np.int64).reshape(-1, len(_TOTAL_FIELDS)),
+        len(variants),
+        len(channels),
+    )
+
+    variant_results: dict[str, Any] = {}
+    window_stats: dict[str, dict[str, int]] = {}
+    for variant, (spend_cents, impressions, clicks, conversions, revenue_cents) in zip(
+        variants, variant_sums.tolist(), strict=True
+    ):
+        window_stats[variant.name] = {
+            "clicks": clicks,
+            "conversions": conversions,
+            "spend_cents": spend_cents,
+        }
         variant_results[variant.name] = {
             "totals": {
-                "spend": float(totals["spend"]),
-                "impressions": totals["impressions"],
-                "clicks": totals["clicks"],
-                "conversions": totals["conversions"],
-                "revenue": float(totals["revenue"]),
+                "spend": spend_cents / 100,
+                "impressions": impressions,
+                "clicks": clicks,
+                "conversions": conversions,
+                "revenue": revenue_cents / 100,
             },
-            "kpis": compute_kpis(totals),
+            "kpis": _kpis_from_cents(spend_cents, revenue_cents, impressions, clicks, conversions),
         }
 
     aggregated_snapshots = [
@@ -262,16 +323,35 @@ def run_experiment_window(
             "channel": channel,
             "window_start": window_start,
             "window_end": window_end,
-            "spend": values["spend"].quantize(Decimal("0.01")),
-            "impressions": values["impressions"],
-            "clicks": values["clicks"],
-            "conversions": values["conversions"],
-            "revenue": values["revenue"].quantize(Decimal("0.01")),
+            "spend": _from_cents(spend_cents),
+            "impressions": impressions,
+            "clicks": clicks,
+            "conversions": conversions,
+            "revenue": _from_cents(revenue_cents),
         }
-        for channel, values in sorted(aggregated.items())
+        for channel, (
+            spend_cents,
+            impressions,
+            clicks,
+            conversions,
+            revenue_cents,
+        ) in zip(channels, channel_sums.tolist(), strict=True)
     ]
 
+    _accumulate_rollups(db, experiment.id, window_stats)
+    # A window later than every stored one becomes the latest result, so its
+    # analysis is computed up front and the row is inserted once, complete.
+    newest_start = db.execute(
+        select(func.max(ExperimentResult.window_start)).where(
+            ExperimentResult.experiment_id == experiment.id
+        )
+    ).scalar()
+    in_order = newest_start is None or window_start >= newest_start
+    analysis = (
+        analyze_experiment(experiment, load_variant_totals(db, experiment.id)) if in_order else None
+    )
     result = ExperimentResult(
+        id=uuid.uuid4(),
         experiment_id=experiment.id,
         window_start=window_start,
         window_end=window_end,
@@ -282,12 +362,16 @@ def run_experiment_window(
                 for name, alloc in per_variant_allocations.items()
             },
         },
+        analysis_json=analysis,
     )
+    # A backfilled window changes the totals behind the latest row's analysis.
+    experiment.last_analyzed_result_id = result.id if in_order else None
     db.add(result)
     db.commit()
     db.refresh(result)
 
-    analysis = evaluate_if_ready(db, experiment.id)
+    if not in_order:
+        analysis = evaluate_if_ready(db, experiment.id)
     db.refresh(experiment)
 
     return {
@@ -3,33 +3,49 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Any
 
+_ZERO = Decimal("0")
+
 
 def _to_decimal(value: Any) -> Decimal:
     if value is None:
-        return Decimal("0")
+        return _ZERO
     if isinstance(value, Decimal):
         return value
+    if isinstance(value, int):
+        return Decimal(value)
     return Decimal(str(value))
 
 
-def _quantize(value: Decimal) -> Decimal:
-    return value.quantize(Decimal("0.01"))
+def _round_cents(numerator: int, denominator: int) -> int:
+    """``numerator / denominator`` rounded half to even, as Decimal.quantize does."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
 
 
 def split_allocations(
     allocations: dict[str, Decimal], variant_shares: dict[str, Decimal]
 ) -> dict[str, dict[str, Decimal]]:
+    # Exact integer arithmetic on the amounts' and shares' rational values:
+    # a channel total a/b dollars and a share s/t give 100*a*s / (b*t) cents.
+    share_ratios = {
+        variant: _to_decimal(share).as_integer_ratio() for variant, share in variant_shares.items()
+    }
     result: dict[str, dict[str, Decimal]] = {name: {} for name in variant_shares}
     for channel, amount in allocations.items():
-        channel_total = _to_decimal(amount)
+        total_num, total_den = _to_decimal(amount).as_integer_ratio()
         split = {
-            variant: _quantize(channel_total * share)
-            for variant, share in variant_shares.items()
+            variant: _round_cents(100 * total_num * share_num, total_den * share_den)
+            for variant, (share_num, share_den) in share_ratios.items()
         }
-        remainder = channel_total - sum(split.values())
         if split:
             largest_variant = max(split.items(), key=lambda item: (item[1], item[0]))[0]
-            split[largest_variant] = _quantize(split[largest_variant] + remainder)
-        for variant, value in split.items():
-            result[variant][channel] = value
+            allocated = sum(split.values())
+            split[largest_variant] = _round_cents(
+                100 * total_num + (split[largest_variant] - allocated) * total_den, total_den
+            )
+        for variant, cents in split.items():
+            result[variant][channel] = Decimal(cents).scaleb(-2)
     return result
@@ -1,35 +1,112 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import math
 from datetime import date
-from decimal import Decimal
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import BigInteger, func, select
 from sqlalchemy.orm import Session
 
 from app.models import ChannelSnapshot, MeasurementReport
 
-
-def _to_decimal(value) -> Decimal:
-    if value is None:
-        return Decimal("0")
-    if isinstance(value, Decimal):
-        return value
-    return Decimal(str(value))
-
-
-def _safe_div(numerator: Decimal, denominator: Decimal) -> float | None:
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    njit = None
+
+_CHANNEL_KPIS = (
+    "ctr",
+    "cvr",
+    "cpc",
+    "cpm",
+    "cac",
+    "roas",
+    "spend_share",
+    "conversion_share",
+    "efficiency_index",
+)
+
+
+def _safe_div(numerator: float, denominator: float) -> float | None:
     if denominator == 0:
         return None
     return float(numerator / denominator)
 
 
-def _to_float(value: Decimal | int | None) -> float:
-    if value is None:
-        return 0.0
-    if isinstance(value, Decimal):
-        return float(value)
-    return float(value)
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise ``numerator / denominator``, NaN where the denominator is zero."""
+    return np.divide(
+        numerator, denominator, out=np.full(len(numerator), np.nan), where=denominator != 0
+    )
+
+
+def _nullable(values: list[float]) -> list[float | None]:
+    return [None if math.isnan(value) else value for value in values]
+
+
+def _channel_kpis_loop(
+    spend: np.ndarray,
+    impressions: np.ndarray,
+    clicks: np.ndarray,
+    conversions: np.ndarray,
+    revenue: np.ndarray,
+    total_spend: float,
+    total_conversions: float,
+) -> np.ndarray:
+    out = np.full((spend.shape[0], len(_CHANNEL_KPIS)), np.nan)
+    for i in range(spend.shape[0]):
+        if impressions[i] != 0:
+            out[i, 0] = clicks[i] / impressions[i]
+            out[i, 3] = spend[i] * 1000 / impressions[i]
+        if clicks[i] != 0:
+            out[i, 1] = conversions[i] / clicks[i]
+            out[i, 2] = spend[i] / clicks[i]
+        if conversions[i] != 0:
+            out[i, 4] = spend[i] / conversions[i]
+        if spend[i] != 0:
+            out[i, 5] = revenue[i] / spend[i]
+        if total_spend != 0:
+            out[i, 6] = spend[i] / total_spend
+        if total_conversions != 0:
+            out[i, 7] = conversions[i] / total_conversions
+        # A missing spend share counts as zero, so efficiency is left unset.
+        if total_spend != 0 and out[i, 6] != 0:
+            out[i, 8] = out[i, 7] / out[i, 6]
+    return out
+
+
+def _channel_kpis_numpy(
+    spend: np.ndarray,
+    impressions: np.ndarray,
+    clicks: np.ndarray,
+    conversions: np.ndarray,
+    revenue: np.ndarray,
+    total_spend: float,
+    total_conversions: float,
+) -> np.ndarray:
+    spend_share = _ratio(spend, np.full_like(spend, total_spend))
+    conv_share = _ratio(conversions, np.full_like(conversions, total_conversions))
+    return np.column_stack(
+        (
+            _ratio(clicks, impressions),
+            _ratio(conversions, clicks),
+            _ratio(spend, clicks),
+            _ratio(spend * 1000, impressions),
+            _ratio(spend, conversions),
+            _ratio(revenue, spend),
+            spend_share,
+            conv_share,
+            _ratio(conv_share, np.nan_to_num(spend_share)),
+        )
+    )
+
+
+# Per-channel KPI matrix with one column per _CHANNEL_KPIS name, NaN where a
+# denominator is zero. Compiled when numba is installed; otherwise vectorized.
+if njit is not None:
+    _channel_kpis = njit(cache=True, nogil=True)(_channel_kpis_loop)
+else:
+    _channel_kpis = _channel_kpis_numpy
 
 
 def compute_report(
@@ -37,104 +114,81 @@ def compute_report(
     campaign_id,
     window_start: date | None = None,
     window_end: date | None = None,
+    *,
+    commit: bool = True,
 ) -> MeasurementReport:
-    query = select(ChannelSnapshot).where(ChannelSnapshot.campaign_id == campaign_id)
+    """Aggregate snapshots into a new report; ``commit=False`` only flushes it."""
+    # Money is summed as Numeric, so channel and report totals are exact
+    # Decimals that are rounded to float once for the JSON report. Channels
+    # are listed alphabetically; the ungrouped query had no defined order.
+    query = (
+        select(
+            ChannelSnapshot.channel,
+            func.sum(ChannelSnapshot.spend),
+            func.sum(ChannelSnapshot.impressions).cast(BigInteger),
+            func.sum(ChannelSnapshot.clicks).cast(BigInteger),
+            func.sum(ChannelSnapshot.conversions).cast(BigInteger),
+            func.sum(ChannelSnapshot.revenue),
+        )
+        .where(ChannelSnapshot.campaign_id == campaign_id)
+        .group_by(ChannelSnapshot.channel)
+        .order_by(ChannelSnapshot.channel)
+    )
     if window_start is not None:
         query = query.where(ChannelSnapshot.window_start >= window_start)
     if window_end is not None:
         query = query.where(ChannelSnapshot.window_end <= window_end)
-
-    snapshots = db.execute(query).scalars().all()
-
-    totals = {
-        "spend": Decimal("0"),
-        "impressions": 0,
-        "clicks": 0,
-        "conversions": 0,
-        "revenue": Decimal("0"),
-    }
-
-    channel_totals: dict[str, dict] = defaultdict(
-        lambda: {
-            "spend": Decimal("0"),
-            "impressions": 0,
-            "clicks": 0,
-            "conversions": 0,
-            "revenue": Decimal("0"),
-        }
-    )
-
-    for snapshot in snapshots:
-        spend = _to_decimal(snapshot.spend)
-        revenue = _to_decimal(snapshot.revenue)
-
-        totals["spend"] += spend
-        totals["impressions"] += int(snapshot.impressions or 0)
-        totals["clicks"] += int(snapshot.clicks or 0)
-        totals["conversions"] += int(snapshot.conversions or 0)
-        totals["revenue"] += revenue
-
-        bucket = channel_totals[snapshot.channel]
-        bucket["spend"] += spend
-        bucket["impressions"] += int(snapshot.impressions or 0)
-        bucket["clicks"] += int(snapshot.clicks or 0)
-        bucket["conversions"] += int(snapshot.conversions or 0)
-        bucket["revenue"] += revenue
-
-    total_spend = totals["spend"]
-    total_impressions = Decimal(str(totals["impressions"]))
-    total_clicks = Decimal(str(totals["clicks"]))
-    total_conversions = Decimal(str(totals["conversions"]))
-    total_revenue = totals["revenue"]
+    rows = db.execute(query).all()
+
+    total_spend = float(sum(row[1] for row in rows))
+    total_impressions = sum(row[2] for row in rows)
+    total_clicks = sum(row[3] for row in rows)
+    total_conversions = sum(row[4] for row in rows)
+    total_revenue = float(sum(row[5] for row in rows))
+    channel_rows = [
+        (channel, float(spend), impressions, clicks, conversions, float(revenue))
+        for channel, spend, impressions, clicks, conversions, revenue in rows
+    ]
 
     kpis = {
         "ctr": _safe_div(total_clicks, total_impressions),
         "cvr": _safe_div(total_conversions, total_clicks),
         "cpc": _safe_div(total_spend, total_clicks),
-        "cpm": _safe_div(total_spend * Decimal("1000"), total_impressions),
+        "cpm": _safe_div(total_spend * 1000, total_impressions),
         "cac": _safe_div(total_spend, total_conversions),
         "roas": _safe_div(total_revenue, total_spend),
     }
 
-    by_channel = []
-    for channel, bucket in channel_totals.items():
-        spend = bucket["spend"]
-        impressions = Decimal(str(bucket["impressions"]))
-        clicks = Decimal(str(bucket["clicks"]))
-        conversions = Decimal(str(bucket["conversions"]))
-        revenue = bucket["revenue"]
-
-        spend_share = _safe_div(spend, total_spend) if total_spend != 0 else None
-        conv_share = _safe_div(conversions, total_conversions) if total_conversions != 0 else None
-        efficiency_index = (
-            _safe_div(Decimal(str(conv_share)), Decimal(str(spend_share)))
-            if spend_share not in (None, 0) and conv_share is not None
-            else None
-        )
-
-        by_channel.append(
-            {
-                "channel": channel,
-                "totals": {
-                    "spend": _to_float(spend),
-                    "impressions": int(bucket["impressions"]),
-                    "clicks": int(bucket["clicks"]),
-                    "conversions": int(bucket["conversions"]),
-                    "revenue": _to_float(revenue),
-                },
-                "kpis": {
-                    "ctr": _safe_div(clicks, impressions),
-                    "cvr": _safe_div(conversions, clicks),
-                    "cpc": _safe_div(spend, clicks),
-                    "cpm": _safe_div(spend * Decimal("1000"), impressions),
-                    "cac": _safe_div(spend, conversions),
-                    "roas": _safe_div(revenue, spend),
-                    "spend_share": spend_share,
-                    "conversion_share": conv_share,
-                    "efficiency_index": efficiency_index,
-                },
-            }
-        )
+    sums = np.array([row[1:] for row in channel_rows], dtype=np.float64).reshape(-1, 5)
+    spend, impressions, clicks, conversions, revenue = sums.T
+    kpi_rows = [
+        _nullable(row)
+        for row in _channel_kpis(
+            spend, impressions, clicks, conversions, revenue, total_spend, float(total_conversions)
+        ).tolist()
+    ]
+
+    by_channel = [
+        {
+            "channel": channel,
+            "totals": {
+                "spend": channel_spend,
+                "impressions": channel_impressions,
+                "clicks": channel_clicks,
+                "conversions": channel_conversions,
+                "revenue": channel_revenue,
+            },
+            "kpis": dict(zip(_CHANNEL_KPIS, kpi_row, strict=True)),
+        }
+        for (
+            channel,
+            channel_spend,
+            channel_impressions,
+            channel_clicks,
+            channel_conversions,
+            channel_revenue,
+        ), kpi_row in zip(channel_rows, kpi_rows, strict=True)
+    ]
 
     report_json = {
         "campaign_id": str(campaign_id),
@@ -143,11 +197,11 @@ def compute_report(
             "end": window_end.isoformat() if window_end else None,
         },
         "totals": {
-            "spend": _to_float(total_spend),
-            "impressions": int(totals["impressions"]),
-            "clicks": int(totals["clicks"]),
-            "conversions": int(totals["conversions"]),
-            "revenue": _to_float(total_revenue),
+            "spend": total_spend,
+            "impressions": total_impressions,
+            "clicks": total_clicks,
+            "conversions": total_conversions,
+            "revenue": total_revenue,
         },
         "kpis": kpis,
         "by_channel": by_channel,
@@ -157,14 +211,17 @@ def compute_report(
         campaign_id=campaign_id,
         window_start=window_start,
         window_end=window_end,
-        total_spend=_to_float(total_spend),
-        total_impressions=int(totals["impressions"]),
-        total_clicks=int(totals["clicks"]),
-        total_conversions=int(totals["conversions"]),
-        total_revenue=_to_float(total_revenue),
+        total_spend=total_spend,
+        total_impressions=total_impressions,
+        total_clicks=total_clicks,
+        total_conversions=total_conversions,
+        total_revenue=total_revenue,
         metrics_json=report_json,
     )
     db.add(report)
-    db.commit()
-    db.refresh(report)
+    if commit:
+        db.commit()
+        db.refresh(report)
+    else:
+        db.flush()
     return report
@@ -6,7 +6,7 @@ from datetime import date
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app.models import (
@@ -20,6 +20,8 @@ from app.models import (
 )
 from app.services.allocation_policy import compute_allocation_decision
 
+_D_ZERO = Decimal("0")
+
 
 def _to_decimal(value: Any) -> Decimal:
     if value is None:
@@ -35,7 +37,7 @@ def _normalize_allocations(
     if not allocations:
         return allocations
     rounded = {k: v.quantize(Decimal("0.01")) for k, v in allocations.items()}
-    remainder = total_budget - sum(rounded.values())
+    remainder = total_budget - sum(rounded.values(), _D_ZERO)
     largest = max(rounded.items(), key=lambda item: (item[1], item[0]))[0]
     rounded[largest] = (rounded[largest] + remainder).quantize(Decimal("0.01"))
     return rounded
@@ -44,7 +46,7 @@ def _normalize_allocations(
 def _allocation_from_weights(
     total_budget: Decimal, weights: dict[str, Decimal]
 ) -> dict[str, Decimal]:
-    total_weight = sum(weights.values())
+    total_weight = sum(weights.values(), _D_ZERO)
     allocations = {
         channel: (total_budget * weight / total_weight) if total_weight else Decimal("0")
         for channel, weight in weights.items()
@@ -82,6 +84,7 @@ def create_plan_from_brief(
     db.flush()
 
     objective = campaign.objective
+    target_cac = campaign.target_cac
     channels_allowed = brief_json.get("channels_allowed") or []
     channels_preferred = set(brief_json.get("channels_preferred") or [])
 
@@ -116,18 +119,23 @@ def create_plan_from_brief(
 
     allocations = _allocation_from_weights(total_budget, dict(weights))
 
-    for channel, allocated in allocations.items():
-        db.add(
-            ChannelBudget(
-                budget_plan_id=budget_plan.id,
-                channel=channel,
-                allocated_budget=allocated,
-            )
+    # One executemany INSERT; the rows are not needed as ORM objects here.
+    if allocations:
+        db.execute(
+            insert(ChannelBudget),
+            [
+                {
+                    "budget_plan_id": budget_plan.id,
+                    "channel": channel,
+                    "allocated_budget": allocated,
+                }
+                for channel, allocated in allocations.items()
+            ],
         )
 
     plan_json = {
         "objective": objective,
-        "target_cac": str(campaign.target_cac) if campaign.target_cac else None,
+        "target_cac": str(target_cac) if target_cac else None,
         "channels": list(allocations.keys()),
         "channels_preferred": list(channels_preferred),
         "pacing": None,
@@ -162,12 +170,20 @@ def optimize_from_report(
     campaign_id,
     report_id,
     budget_plan_id,
+    *,
+    commit: bool = True,
 ) -> OptimizeResult:
-    campaign = db.get(Campaign, campaign_id)
-    report = db.get(MeasurementReport, report_id)
-    budget_plan = db.get(BudgetPlan, budget_plan_id)
-    if campaign is None or report is None or budget_plan is None:
+    """Decide and apply new allocations; ``commit=False`` only flushes the changes."""
+    # One round-trip for all three rows; the joins only carry the key filters.
+    row = db.execute(
+        select(Campaign, MeasurementReport, BudgetPlan)
+        .join_from(Campaign, MeasurementReport, MeasurementReport.id == report_id)
+        .join_from(Campaign, BudgetPlan, BudgetPlan.id == budget_plan_id)
+        .where(Campaign.id == campaign_id)
+    ).one_or_none()
+    if row is None:
         raise ValueError("Missing campaign, report, or budget plan")
+    campaign, report, budget_plan = row
 
     channel_budgets = (
         db.execute(select(ChannelBudget).where(ChannelBudget.budget_plan_id == budget_plan_id))
@@ -190,9 +206,11 @@ def optimize_from_report(
         },
     )
 
-    for entry in channel_budgets:
-        if entry.channel in decision.new_allocations:
-            entry.allocated_budget = decision.new_allocations[entry.channel]
+    # Hold decisions hand back the current allocations unchanged.
+    if decision.new_allocations is not current_allocations:
+        for entry in channel_budgets:
+            if entry.channel in decision.new_allocations:
+                entry.allocated_budget = decision.new_allocations[entry.channel]
 
     allocation_decision = AllocationDecision(
         campaign_id=campaign.id,
@@ -204,8 +222,11 @@ def optimize_from_report(
         rationale_json=decision.rationale,
     )
     db.add(allocation_decision)
-    db.commit()
-    db.refresh(allocation_decision)
+    if commit:
+        db.commit()
+        db.refresh(allocation_decision)
+    else:
+        db.flush()
 
     return OptimizeResult(
         decision=allocation_decision,
@@ -20,6 +20,9 @@ class Settings(BaseSettings):
     ANTHROPIC_MODEL: str = "claude-sonnet-4-20250514"
 
     USE_DRY_RUN_EXECUTION: bool = True
+    # Overlap the execution-row flush with live platform calls. Off by default
+    # because it holds the DB transaction open for the duration of the API call.
+    OVERLAP_LIVE_EXECUTION_FLUSH: bool = False
 
     META_ACCESS_TOKEN: str = ""
     META_APP_SECRET: str = ""
@@ -10,6 +10,7 @@ import hashlib
 import io
 import os
 import tempfile
+import threading
 from typing import Any
 
 import httpx
@@ -33,6 +34,25 @@ META_SUPPORTED_FORMATS: set[str] = {"JPEG", "PNG", "BMP", "TIFF", "GIF"}
 class ImageProcessor:
     """Download, validate, optimise, and hash images for ad platforms."""
 
+    def __init__(self) -> None:
+        # Created on first sync download and kept, so later downloads reuse
+        # its connection pool instead of reconnecting for every image.
+        self._sync_client: httpx.Client | None = None
+        # Downloads run in worker threads; only one may create the client.
+        self._sync_client_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the pooled sync client, if one was created."""
+        with self._sync_client_lock:
+            client, self._sync_client = self._sync_client, None
+        if client is not None:
+            client.close()
+
+    def __del__(self) -> None:
+        # Best effort for processors that are dropped without close().
+        if getattr(self, "_sync_client", None) is not None:
+            self._sync_client.close()
+
     # ------------------------------------------------------------------
     # download
     # ------------------------------------------------------------------
@@ -64,10 +84,15 @@ class ImageProcessor:
 
     def download_image_sync(self, url: str, *, timeout: float = 30.0) -> bytes:
         """Synchronous variant used inside ``asyncio.to_thread`` contexts."""
+        client = self._sync_client
+        if client is None:
+            with self._sync_client_lock:
+                client = self._sync_client
+                if client is None:
+                    client = self._sync_client = httpx.Client(follow_redirects=True)
         try:
-            with httpx.Client(follow_redirects=True) as client:
-                response = client.get(url, timeout=timeout)
-                response.raise_for_status()
+            response = client.get(url, timeout=timeout)
+            response.raise_for_status()
         except httpx.HTTPError as exc:
             raise ImageDownloadError(
                 f"Failed to download image from {url}: {exc}",
@@ -127,6 +127,43 @@ async def test_execute_campaign_no_db_session():
     assert result == {"error": "No database session available"}
 
 
+@pytest.mark.asyncio
+async def test_execute_campaign_cancels_platform_call_when_flush_fails(
+    async_db, campaign, monkeypatch
+):
+    import asyncio
+
+    from app.services.agents.tools import execute_campaign as module
+
+    cancelled = asyncio.Event()
+
+    async def slow_create(*_args, **_kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing_flush(*_args, **_kwargs):
+        await asyncio.sleep(0)
+        raise RuntimeError("flush failed")
+
+    monkeypatch.setattr(module.settings, "OVERLAP_LIVE_EXECUTION_FLUSH", True)
+    monkeypatch.setattr(module, "_create_on_platform", slow_create)
+    monkeypatch.setattr(async_db, "flush", failing_flush)
+
+    with pytest.raises(RuntimeError, match="flush failed"):
+        await module.execute_campaign_on_platform(
+            campaign_id=str(campaign.id),
+            platform="meta",
+            campaign_name="Overlap",
+            objective="conversions",
+            total_budget=1000.0,
+            _db_session=async_db,
+        )
+    assert cancelled.is_set()
+
+
 # ---------------------------------------------------------------------------
 # Manage campaign tools
 # ---------------------------------------------------------------------------
@@ -193,3 +230,22 @@ async def test_pause_campaign_not_found(async_db):
 
     assert "error" in result
     assert "not found" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_actions_defers_action_inserts(async_db, execution):
+    from app.services.agents.tool_registry import ToolRegistry
+    from app.services.agents.tools.manage_campaign import (
+        pause_platform_campaign,
+        resume_platform_campaign,
+    )
+
+    query = select(ExecutionAction).where(ExecutionAction.execution_id == execution.id)
+
+    async with ToolRegistry.batch_actions(async_db):
+        await pause_platform_campaign(execution_id=str(execution.id), _db_session=async_db)
+        await resume_platform_campaign(execution_id=str(execution.id), _db_session=async_db)
+        assert not async_db.new
+
+    actions = (await async_db.execute(query)).scalars().all()
+    assert sorted(a.action_type for a in actions) == ["pause_campaign", "resume_campaign"]
@@ -1,5 +1,7 @@
+import uuid
+
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, delete, select
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -186,3 +188,221 @@ def test_experiment_aggregation_does_not_pollute_channel_names():
         snapshots = session.execute(select(models.ChannelSnapshot)).scalars().all()
         channels = {snapshot.channel for snapshot in snapshots}
         assert all("|" not in channel for channel in channels)
+
+
+def test_experiment_rollups_match_result_history():
+    from app.services.experimentation.evaluator import sum_result_history
+
+    engine, TestingSessionLocal = setup_test_db()
+    client = TestClient(app)
+
+    campaign, plan = _create_campaign_and_plan(client, "Experiment D")
+
+    experiment_resp = client.post(
+        f"/campaigns/{campaign['id']}/experiments",
+        json={
+            "experiment_type": "creative",
+            "primary_metric": "cvr",
+            "min_sample_conversions": 100000,
+            "variants": [
+                {"name": "A", "traffic_share": 0.5, "variant": {"description": "A"}},
+                {"name": "B", "traffic_share": 0.5, "variant": {"description": "B"}},
+            ],
+        },
+    )
+    experiment = experiment_resp.json()
+    client.post(f"/experiments/{experiment['id']}/start")
+    experiment_id = uuid.UUID(experiment["id"])
+
+    def run_cycles(start_date: str) -> None:
+        resp = client.post(
+            f"/campaigns/{campaign['id']}/run-cycles",
+            json={
+                "budget_plan_id": plan["budget_plan_id"],
+                "n": 2,
+                "start_date": start_date,
+                "window_days": 7,
+                "seed": 5,
+            },
+        )
+        assert resp.status_code == 200
+
+    def rollups(session) -> dict:
+        return {
+            row.variant_name: {
+                "clicks": row.clicks,
+                "conversions": row.conversions,
+                "spend_cents": row.spend_cents,
+            }
+            for row in session.execute(select(models.ExperimentRollup)).scalars()
+        }
+
+    run_cycles("2025-03-01")
+    with TestingSessionLocal() as session:
+        history = sum_result_history(session, experiment_id)
+        assert set(history) == {"A", "B"}
+        assert rollups(session) == history
+
+        # Rollups missing for older windows are seeded from the stored history.
+        session.execute(delete(models.ExperimentRollup))
+        session.commit()
+
+    run_cycles("2025-03-15")
+    with TestingSessionLocal() as session:
+        assert rollups(session) == sum_result_history(session, experiment_id)
+
+
+def test_evaluate_reuses_analysis_of_latest_window():
+    from app.services.experimentation.evaluator import evaluate_if_ready
+
+    engine, TestingSessionLocal = setup_test_db()
+    client = TestClient(app)
+
+    campaign, plan = _create_campaign_and_plan(client, "Experiment E")
+
+    experiment_resp = client.post(
+        f"/campaigns/{campaign['id']}/experiments",
+        json={
+            "experiment_type": "creative",
+            "primary_metric": "cvr",
+            "variants": [
+                {"name": "A", "traffic_share": 0.5, "variant": {"description": "A"}},
+                {"name": "B", "traffic_share": 0.5, "variant": {"description": "B"}},
+            ],
+        },
+    )
+    experiment = experiment_resp.json()
+    client.post(f"/experiments/{experiment['id']}/start")
+    experiment_id = uuid.UUID(experiment["id"])
+
+    run_resp = client.post(
+        f"/campaigns/{campaign['id']}/run-cycle",
+        json={
+            "budget_plan_id": plan["budget_plan_id"],
+            "window_start": "2025-03-01",
+            "window_end": "2025-03-07",
+            "seed": 11,
+        },
+    )
+    assert run_resp.status_code == 200
+
+    with TestingSessionLocal() as session:
+        latest = session.execute(
+            select(models.ExperimentResult).where(
+                models.ExperimentResult.experiment_id == experiment_id
+            )
+        ).scalar_one()
+        assert session.get(models.Experiment, experiment_id).last_analyzed_result_id == latest.id
+
+        # Overwrite the stored analysis: an unchanged latest window is not re-analyzed.
+        latest.analysis_json = {"cached": True}
+        session.commit()
+        assert evaluate_if_ready(session, experiment_id) == {"cached": True}
+
+
+def test_backfilled_window_refreshes_latest_analysis():
+    from app.services.experimentation.evaluator import sum_result_history
+
+    engine, TestingSessionLocal = setup_test_db()
+    client = TestClient(app)
+
+    campaign, plan = _create_campaign_and_plan(client, "Experiment F")
+
+    experiment_resp = client.post(
+        f"/campaigns/{campaign['id']}/experiments",
+        json={
+            "experiment_type": "creative",
+            "primary_metric": "cvr",
+            "min_sample_conversions": 100000,
+            "variants": [
+                {"name": "A", "traffic_share": 0.5, "variant": {"description": "A"}},
+                {"name": "B", "traffic_share": 0.5, "variant": {"description": "B"}},
+            ],
+        },
+    )
+    experiment = experiment_resp.json()
+    client.post(f"/experiments/{experiment['id']}/start")
+    experiment_id = uuid.UUID(experiment["id"])
+
+    def run_cycle(window_start: str, window_end: str) -> dict:
+        resp = client.post(
+            f"/campaigns/{campaign['id']}/run-cycle",
+            json={
+                "budget_plan_id": plan["budget_plan_id"],
+                "window_start": window_start,
+                "window_end": window_end,
+                "seed": 11,
+            },
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    run_cycle("2025-03-08", "2025-03-14")
+    # The earlier window arrives second and must not reuse the stale analysis.
+    backfill = run_cycle("2025-03-01", "2025-03-07")
+
+    with TestingSessionLocal() as session:
+        history = sum_result_history(session, experiment_id)
+        expected = {name: stats["clicks"] for name, stats in history.items()}
+        latest = session.execute(
+            select(models.ExperimentResult)
+            .where(models.ExperimentResult.experiment_id == experiment_id)
+            .order_by(models.ExperimentResult.window_start.desc())
+            .limit(1)
+        ).scalar_one()
+        stored = {name: s["clicks"] for name, s in latest.analysis_json["variant_stats"].items()}
+        assert stored == expected
+        assert session.get(models.Experiment, experiment_id).last_analyzed_result_id == latest.id
+
+    returned = backfill["experiment"]["analysis"]["variant_stats"]
+    assert {name: s["clicks"] for name, s in returned.items()} == expected
+
+
+def test_variant_kpis_match_window_totals():
+    engine, TestingSessionLocal = setup_test_db()
+    client = TestClient(app)
+
+    campaign, plan = _create_campaign_and_plan(client, "Experiment G", total_budget=8000)
+
+    experiment_resp = client.post(
+        f"/campaigns/{campaign['id']}/experiments",
+        json={
+            "experiment_type": "creative",
+            "primary_metric": "cvr",
+            "variants": [
+                {"name": "A", "traffic_share": 0.5, "variant": {"description": "A"}},
+                {"name": "B", "traffic_share": 0.5, "variant": {"description": "B"}},
+            ],
+        },
+    )
+    experiment = experiment_resp.json()
+    client.post(f"/experiments/{experiment['id']}/start")
+
+    run_resp = client.post(
+        f"/campaigns/{campaign['id']}/run-cycle",
+        json={
+            "budget_plan_id": plan["budget_plan_id"],
+            "window_start": "2025-03-01",
+            "window_end": "2025-03-07",
+            "seed": 3,
+        },
+    )
+    assert run_resp.status_code == 200
+
+    with TestingSessionLocal() as session:
+        result = session.execute(select(models.ExperimentResult)).scalar_one()
+        variants = result.results_json["variants"]
+
+    assert set(variants) == {"A", "B"}
+    for entry in variants.values():
+        totals, kpis = entry["totals"], entry["kpis"]
+        assert totals["spend"] > 0 and totals["clicks"] > 0 and totals["conversions"] > 0
+        assert kpis["ctr"] == totals["clicks"] / totals["impressions"]
+        assert kpis["cvr"] == totals["conversions"] / totals["clicks"]
+        assert round(kpis["cpc"], 9) == round(totals["spend"] / totals["clicks"], 9)
+        assert round(kpis["cpm"], 9) == round(totals["spend"] * 1000 / totals["impressions"], 9)
+        assert round(kpis["cac"], 9) == round(totals["spend"] / totals["conversions"], 9)
+        assert round(kpis["roas"], 9) == round(totals["revenue"] / totals["spend"], 9)
+        assert round(kpis["conversions_per_dollar"], 9) == round(
+            totals["conversions"] / totals["spend"], 9
+        )
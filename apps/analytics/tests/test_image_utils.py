@@ -197,3 +197,33 @@ async def test_download_non_image_content_type(processor):
 
         with pytest.raises(ImageDownloadError, match="content-type"):
             await processor.download_image("https://example.com/page.html")
+
+
+def test_download_sync_reuses_client(processor):
+    """Sync downloads share one httpx.Client across calls."""
+    fake_image = _make_image()
+    mock_response = MagicMock()
+    mock_response.content = fake_image
+    mock_response.headers = {"content-type": "image/png"}
+    mock_response.raise_for_status = MagicMock()
+
+    with patch("app.utils.image_utils.httpx.Client") as mock_client_cls:
+        mock_client_cls.return_value.get.return_value = mock_response
+
+        assert processor.download_image_sync("https://example.com/a.png") == fake_image
+        assert processor.download_image_sync("https://example.com/b.png") == fake_image
+
+    mock_client_cls.assert_called_once_with(follow_redirects=True)
+    assert mock_client_cls.return_value.get.call_count == 2
+
+
+def test_close_releases_sync_client(processor):
+    with patch("app.utils.image_utils.httpx.Client") as mock_client_cls:
+        mock_client_cls.return_value.get.return_value = MagicMock(
+            content=b"x", headers={"content-type": "image/png"}
+        )
+        processor.download_image_sync("https://example.com/a.png")
+        processor.close()
+        processor.close()
+
+    mock_client_cls.return_value.close.assert_called_once_with()
@@ -94,6 +94,7 @@ def test_measurement_flow():
     assert round(kpis["cac"], 6) == round(1500.0 / 17.0, 6)
     assert round(kpis["roas"], 6) == round(3400.0 / 1500.0, 6)
 
+    # Channels are listed alphabetically, not in the order snapshots arrived
+    assert [item["channel"] for item in report["by_channel"]] == ["google", "meta"]
     channels = {item["channel"]: item for item in report["by_channel"]}
-    assert "meta" in channels and "google" in channels
     assert channels["google"]["kpis"]["ctr"] is None
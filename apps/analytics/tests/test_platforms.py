@@ -11,7 +11,7 @@ from app.platforms.base import (
     ValidationIssue,
 )
 from app.platforms.dry_run import DryRunExecutor
-from app.platforms.factory import get_platform_adapter
+from app.platforms.factory import clear_adapter_cache, get_platform_adapter
 
 
 # ---------------------------------------------------------------------------
@@ -172,9 +172,17 @@ def test_factory_raises_for_unimplemented_adapter():
         get_platform_adapter("google", dry_run=False)
 
 
+def test_factory_returns_fresh_dry_run_executors():
+    # Dry-run executors hold idempotency state, so they must not be shared
+    assert get_platform_adapter("meta", dry_run=True) is not get_platform_adapter(
+        "meta", dry_run=True
+    )
+
+
 def test_factory_returns_meta_adapter():
     from unittest.mock import patch
 
+    clear_adapter_cache()
     with patch("app.platforms.meta_ads.FacebookAdsApi"), patch(
         "app.platforms.meta_ads.AdAccount"
     ):
@@ -182,3 +190,7 @@ def test_factory_returns_meta_adapter():
 
         adapter = get_platform_adapter("meta", dry_run=False)
         assert isinstance(adapter, MetaAdsAdapter)
+        # "meta" and Platform.META share one cached adapter
+        assert get_platform_adapter(Platform.META, dry_run=False) is adapter
+    # Don't leak the adapter built against the patched SDK into other tests
+    clear_adapter_cache()
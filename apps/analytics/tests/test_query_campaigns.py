@@ -0,0 +1,44 @@
+"""Tests for the query_past_campaigns data tool."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db import Base
+from app.models import Campaign, MeasurementReport
+from app.services.agents.tools.query_campaigns import query_past_campaigns
+from tests.conftest import setup_async_test_db
+
+
+@pytest.fixture
+async def async_db():
+    engine, SessionFactory = setup_async_test_db()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionFactory() as session:
+        yield session
+    await engine.dispose()
+
+
+def _report(campaign: Campaign, day: int, cac: float) -> MeasurementReport:
+    return MeasurementReport(
+        campaign_id=campaign.id,
+        metrics_json={"cac": cac},
+        created_at=datetime(2026, 1, day, tzinfo=timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_past_campaigns_returns_latest_report(async_db):
+    reported = Campaign(name="Reported", objective="conversions")
+    unreported = Campaign(name="Unreported", objective="conversions")
+    async_db.add_all([reported, unreported])
+    await async_db.flush()
+    async_db.add_all([_report(reported, 1, 50.0), _report(reported, 2, 40.0)])
+    await async_db.flush()
+
+    result = await query_past_campaigns(_db_session=async_db)
+
+    assert result["count"] == 2
+    metrics = {c["name"]: c["latest_metrics"] for c in result["campaigns"]}
+    assert metrics == {"Reported": {"cac": 40.0}, "Unreported": None}
@@ -1,6 +1,10 @@
 import pytest
+from sqlalchemy import func, select
 
+from app.db import Base
+from app.models import AgentSession, Tool, ToolExecution
 from app.services.agents.tool_registry import ToolRegistry, ToolSpec
+from tests.conftest import setup_async_test_db
 
 
 async def dummy_tool(query: str, **_kwargs) -> dict:
@@ -59,6 +63,27 @@ async def test_search_tools(registry: ToolRegistry):
     assert len(results) == 0
 
 
+@pytest.mark.asyncio
+async def test_search_tools_multi_token_and_partial(registry: ToolRegistry):
+    assert [t.name for t in registry.search("Test SEARCH tool")] == ["test_search"]
+    assert [t.name for t in registry.search("sear")] == ["test_search"]
+    assert registry.search("search missing") == []
+
+
+@pytest.mark.asyncio
+async def test_reregister_replaces_search_postings(registry: ToolRegistry):
+    spec = ToolSpec(
+        name="test_search",
+        description="A keyword lookup",
+        category="data",
+        parameters_schema={"type": "object", "properties": {}},
+    )
+    registry.register(spec, dummy_tool)
+    assert [t.name for t in registry.search("keyword")] == ["test_search"]
+    assert registry.search("tool") == []
+    assert [t.name for t in registry.search("test_search")] == ["test_search"]
+
+
 @pytest.mark.asyncio
 async def test_execute_success(registry: ToolRegistry):
     result = await registry.execute("test_search", {"query": "marketing trends"})
@@ -104,3 +129,121 @@ async def test_get_anthropic_schemas_filtered(registry: ToolRegistry):
     assert len(schemas) == 1
     schemas = registry.get_tool_schemas_for_anthropic(tool_names=["nonexistent"])
     assert len(schemas) == 0
+
+
+@pytest.mark.asyncio
+async def test_tool_schemas_rebuilt_after_register(registry: ToolRegistry):
+    first = registry.get_tool_schemas_for_anthropic()
+    assert registry.get_tool_schemas_for_anthropic() is first
+    spec = ToolSpec(
+        name="other",
+        description="Another tool",
+        category="data",
+        parameters_schema={"type": "object", "properties": {}},
+    )
+    registry.register(spec, dummy_tool)
+    assert [s["name"] for s in registry.get_tool_schemas_for_anthropic()] == [
+        "test_search",
+        "other",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_cacheable_reuses_result():
+    calls: list[str] = []
+
+    async def counting_tool(query: str, **_kwargs) -> dict:
+        calls.append(query)
+        return {"result": query}
+
+    reg = ToolRegistry()
+    spec = ToolSpec(
+        name="cached",
+        description="cached data tool",
+        category="data",
+        parameters_schema={"type": "object"},
+        cacheable=True,
+        cache_ttl_s=60,
+    )
+    reg.register(spec, counting_tool)
+
+    first = await reg.execute("cached", {"query": "a", "_db_session": object()})
+    first.output["result"] = "mutated"
+    second = await reg.execute("cached", {"query": "a", "_db_session": object()})
+    third = await reg.execute("cached", {"query": "b"})
+
+    assert second.output == {"result": "a"}
+    assert second.output is not first.output
+    fourth = await reg.execute("cached", {"query": "a"})
+    assert fourth.output == {"result": "a"}
+    assert second.duration_ms == 0
+    assert third.output == {"result": "b"}
+    assert calls == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_execute_logs_with_single_tool_row(registry: ToolRegistry):
+    engine, SessionFactory = setup_async_test_db()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionFactory() as db:
+        session = AgentSession(goal="test")
+        db.add(session)
+        await db.flush()
+
+        # Second registry hits the ON CONFLICT path for the existing row
+        other = ToolRegistry()
+        other.register(registry.get("test_search"), dummy_tool)
+        for reg in (registry, registry, other):
+            await reg.execute("test_search", {"query": "q"}, session_id=session.id, db=db)
+
+        tools = (await db.execute(select(func.count()).select_from(Tool))).scalar()
+        logged = (await db.execute(select(func.count()).select_from(ToolExecution))).scalar()
+        assert tools == 1
+        assert logged == 3
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_tool_id_cache_survives_rollback(registry: ToolRegistry):
+    engine, SessionFactory = setup_async_test_db()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionFactory() as db:
+        session = AgentSession(goal="test")
+        db.add(session)
+        await db.commit()
+        session_id = session.id
+
+        # The Tool row inserted here is rolled back, so its id must not be reused
+        await registry.execute("test_search", {"query": "q"}, session_id=session_id, db=db)
+        await db.rollback()
+
+        await registry.execute("test_search", {"query": "q"}, session_id=session_id, db=db)
+        await db.commit()
+        tool = (await db.execute(select(Tool))).scalar_one()
+        execution = (await db.execute(select(ToolExecution))).scalar_one()
+        assert execution.tool_id == tool.id
+
+        # An existing row is looked up, not rewritten with the spec's description
+        tool.description = "edited"
+        await db.commit()
+        other = ToolRegistry()
+        other.register(registry.get("test_search"), dummy_tool)
+        await other.execute("test_search", {"query": "q"}, session_id=session_id, db=db)
+        await db.commit()
+        await db.refresh(tool)
+        assert tool.description == "edited"
+    await engine.dispose()
+
+
+def test_bounded_json_truncates_large_payloads():
+    from app.services.agents.tool_registry import _bounded_json
+
+    small = {"query": "q"}
+    assert _bounded_json(small) is small
+
+    large = _bounded_json({"blob": "x" * 20000})
+    assert large["_truncated"] is True
+    assert len(large["_sha256"]) == 64
+    assert large["_preview"].startswith('{"blob":"xxx')